@@ -1,6 +1,16 @@
 import argparse
-from wordle_solver import WordleSolver
+import sys
+from wordle_solver import WordleSolver, STRATEGIES, optimal_score_settings, dictionary_settings
 from wordle_optimizer import WordleOptimizer
+from wordle_opening_book import WordleOpeningBook
+from wordle_decision_tree import WordleDecisionTree
+from wordle_evaluation import WordleEvaluation
+from wordle_result_store import WordleResultStore, DEFAULT_RESULT_STORE_PATH
+from wordle_batch import WordleBatchSolver
+from wordle_server import WordleServer, DEFAULT_SESSION_TTL, DEFAULT_SESSION_MEMORY_CAP_MB
+from wordle_tracer import WordleTracer
+from wordle_feedback import MAX_WORD_LEN
+from wordle_lookahead import lookahead_settings
 
 
 def main() -> int:
@@ -10,15 +20,138 @@ def main() -> int:
     # parser.add_argument('--optimize', dest='optimize', action='store_true',
     parser.add_argument('--optimize', nargs='?', const=50, type=int, default=0,
                         help='run model optimizer using random parameter values for N iterations (default: 50)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes to use when running the model optimizer (default: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='random seed for the model optimizer, for reproducible runs')
+    parser.add_argument('--search', choices=['random', 'halving'], default='random',
+                        help='optimizer search mode: score every random sample on all historical words, or use '
+                             'successive halving to drop weak samples early (default: random)')
+    parser.add_argument('--store', metavar='PATH', default=DEFAULT_RESULT_STORE_PATH,
+                        help='SQLite file the model optimizer saves every sample\'s result to, and serves previously '
+                             'simulated samples from (default: {})'.format(DEFAULT_RESULT_STORE_PATH))
+    parser.add_argument('--no_store', dest='store', action='store_const', const=None,
+                        help='don\'t save or reuse model optimizer results')
+    parser.add_argument('--save_best_settings', metavar='NAME', default=None,
+                        help='save the best settings in the optimizer result store (scored on every historical word) as '
+                             'score profile NAME')
+    parser.add_argument('--profile', metavar='NAME', default=None,
+                        help='use the settings of a saved score profile instead of the built-in optimal ones')
+    parser.add_argument('--strategy', choices=STRATEGIES, default='heuristic',
+                        help='how to choose each guess: heuristic letter / word frequency scoring, maximum expected '
+                             'information (entropy), fewest expected remaining words (min_expected), or a search a '
+                             'few guesses ahead of the heuristic\'s best guesses, within --lookahead_budget_ms per move '
+                             '(lookahead) (default: heuristic)')
+    parser.add_argument('--batch', dest='batch', action='store_true',
+                        help='read game states as JSON lines on stdin and write the next best guess for each one as '
+                             'JSON lines on stdout, e.g. {"guesses": [{"word": "tares", "yellow": [2], "green": [5]}]}')
+    parser.add_argument('--serve', metavar='ADDRESS', default=None,
+                        help='run a multi-session solver server on HOST:PORT (TCP) or unix:PATH (Unix socket), using '
+                             '--workers threads for scoring')
+    parser.add_argument('--session_ttl', type=float, default=DEFAULT_SESSION_TTL,
+                        help='seconds before an idle server session is evicted (default: {})'.format(DEFAULT_SESSION_TTL))
+    parser.add_argument('--memory_cap_mb', type=float, default=DEFAULT_SESSION_MEMORY_CAP_MB,
+                        help='approximate memory cap for server session state, in MB (default: {})'.format(DEFAULT_SESSION_MEMORY_CAP_MB))
+    parser.add_argument('--lookahead_budget_ms', type=float, default=None,
+                        help='time allowed per move for the lookahead strategy\'s search (default: {:g})'.format(lookahead_settings['budget_ms']))
+    parser.add_argument('--build_opening_book', dest='build_opening_book', action='store_true',
+                        help='precompute and save the guesses for the opening turns of every game')
+    parser.add_argument('--build_decision_tree', nargs='?', const='historical', choices=['historical', 'dictionary'], default=None,
+                        help='precompute and save the guesses for every state reached when solving the historical answers '
+                             '(or every dictionary word), and report its depth and worst-case guess count')
+    parser.add_argument('--evaluate', metavar='DIR', default=None,
+                        help='play every dictionary word (see --evaluate_answers) for one shard of a resumable evaluation, '
+                             'checkpointing the results to DIR (shared by all shards)')
+    parser.add_argument('--shard', default='0/1',
+                        help='which shard to evaluate, as INDEX/COUNT starting from 0 - e.g. 2/8 (default: 0/1)')
+    parser.add_argument('--evaluate_answers', choices=['dictionary', 'historical'], default='dictionary',
+                        help='words to evaluate against (default: dictionary)')
+    parser.add_argument('--merge_evaluation', metavar='DIR', default=None,
+                        help='combine the finished shards in DIR into the guess-count distribution and failed words')
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help='record per-turn phase timings and word counts while playing or optimizing, and save them '
+                             'as JSON to PATH')
+    parser.add_argument('--chrome_trace', metavar='PATH', default=None,
+                        help='as --trace, but save them in Chrome trace-event format (for chrome://tracing or Perfetto)')
+    parser.add_argument('--words', metavar='PATH', default=None,
+                        help='word-frequency CSV (word,count lines) to use as the dictionary (default: resources/word_frequencies.csv)')
+    parser.add_argument('--word_length', type=int, default=None,
+                        help='play with words of this length, up to {} (default: 5)'.format(MAX_WORD_LEN))
+    parser.add_argument('--min_frequency', type=int, default=None,
+                        help='leave out dictionary words used fewer times than this (default: 0)')
+    parser.add_argument('--stats_sample', type=int, default=None,
+                        help='estimate the letter statistics from a random sample of this many words while more than '
+                             'that remain - faster for large dictionaries, but less accurate (default: 0, exact)')
     args = parser.parse_args()
+    try:
+        WordleSolver.configure_dictionary(args.words, args.word_length, args.min_frequency, args.stats_sample)
+        WordleSolver.load_words()
+    except (ValueError, OSError) as e:
+        print("\n**** ERROR: {} ****\n".format(e))
+        return 1
+    # Optimizing, and building or evaluating against the historical answers, all play the historical answers - which
+    # only come in the standard word length
+    plays_historical = args.optimize or args.build_decision_tree == 'historical' or (args.evaluate and not args.merge_evaluation and args.evaluate_answers == 'historical')
+    if plays_historical and not WordleOptimizer._get_historical_words():
+        print("\n**** ERROR: no {}-letter historical answers ****\n".format(dictionary_settings['word_len']))
+        return 1
+    if args.lookahead_budget_ms is not None:
+        lookahead_settings['budget_ms'] = args.lookahead_budget_ms
+    tracer = WordleTracer() if args.trace or args.chrome_trace else None
+
+    if args.profile:
+        try:
+            optimal_score_settings.update(WordleResultStore.load_profile(args.profile))
+        except ValueError as e:
+            print("\n**** ERROR: {} ****\n".format(e))
+            return 1
 
     # Init solver and start the game!
-    if args.optimize:
-        WordleOptimizer.optimize_scoring_model(args.hard_mode, args.optimize)
+    if args.serve:
+        return WordleServer(hard_mode=args.hard_mode, strategy=args.strategy, workers=args.workers, session_ttl=args.session_ttl,
+                            memory_cap_mb=args.memory_cap_mb).run(args.serve)
+    elif args.batch:
+        return WordleBatchSolver(hard_mode=args.hard_mode, strategy=args.strategy).run()
+    elif args.build_opening_book:
+        book = WordleOpeningBook.build_book(args.hard_mode, strategy=args.strategy)
+        print("Saved {} opening book entries to {}".format(len(book), WordleOpeningBook.save_book(book, args.hard_mode, strategy=args.strategy)))
+        return 0
+    elif args.build_decision_tree:
+        tree, guess_counts, failed_words = WordleDecisionTree.build_tree(args.hard_mode, strategy=args.strategy, answers=WordleSolver.word_list() if args.build_decision_tree == 'dictionary' else None)
+        WordleDecisionTree.print_report(tree, guess_counts, failed_words)
+        print("Saved {} decision tree nodes to {}".format(len(tree), tree.save()))
         return 0
+    elif args.evaluate or args.merge_evaluation:
+        try:
+            if args.merge_evaluation:
+                WordleEvaluation.print_summary(WordleEvaluation.merge(args.merge_evaluation))
+                return 0
+            shard_index, _, shard_count = args.shard.partition('/')
+            return WordleEvaluation.run_shard(args.evaluate, int(shard_index), int(shard_count or 1), args.hard_mode, strategy=args.strategy, answer_set=args.evaluate_answers)
+        except ValueError as e:
+            print("\n**** ERROR: {} ****\n".format(e))
+            return 1
+    elif args.save_best_settings:
+        return WordleOptimizer.save_best_settings(args.hard_mode, args.save_best_settings, strategy=args.strategy, store=WordleResultStore(args.store or DEFAULT_RESULT_STORE_PATH))
+    elif args.optimize and args.search == 'halving':
+        WordleOptimizer.optimize_scoring_model_halving(args.hard_mode, args.optimize, workers=args.workers, seed=args.seed, strategy=args.strategy, tracer=tracer,
+                                                       store=WordleResultStore(args.store) if args.store else None)
+        result = 0
+    elif args.optimize:
+        WordleOptimizer.optimize_scoring_model(args.hard_mode, args.optimize, workers=args.workers, seed=args.seed, strategy=args.strategy, tracer=tracer,
+                                               store=WordleResultStore(args.store) if args.store else None)
+        result = 0
     else:
-        return WordleSolver(hard_mode=args.hard_mode).play_game()
+        result = WordleSolver(hard_mode=args.hard_mode, opening_book=WordleOpeningBook.load_book(args.hard_mode, strategy=args.strategy), strategy=args.strategy, tracer=tracer,
+                              decision_tree=WordleDecisionTree.load(args.hard_mode, strategy=args.strategy)).play_game()
+        # play_game returns -1 when no words remain - exit with 1 like the other failures
+        result = 1 if result < 0 else result
+
+    if tracer:
+        tracer.print_summary()
+        tracer.save(args.trace, args.chrome_trace)
+    return result
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,136 @@
+import sys
+import json
+import string
+from collections import OrderedDict
+
+from wordle_solver import WordleSolver
+from wordle_feedback import WordleFeedback
+from wordle_opening_book import WordleOpeningBook
+from wordle_decision_tree import WordleDecisionTree
+
+# Max # of game states whose next guess is remembered across lines
+BATCH_RESULT_CACHE_SIZE = 100000
+
+# Max # of entries added to each mode's opening book on top of the saved book - the guesses in a state are chosen by
+# the client, so the states it records aren't bounded by the solver's own play
+BATCH_OPENING_BOOK_MAX_NEW_ENTRIES = 10000
+
+
+class WordleBatchSolver:
+    # Non-interactive solver for a stream of game states - each state is a guess history with the YELLOW and GREEN
+    # positions (starting from 1) of every guess, e.g.:
+    #   {"id": 1, "guesses": [{"word": "tares", "yellow": [2], "green": [5]}]}
+    # and the answer is the best next guess:
+    #   {"id": 1, "guess": "...", "remaining": 42, "solved": false}
+    # A "hard_mode" key on a state overrides the default mode.  One solver per mode is reset and reused for every
+    # state, the opening book is shared between states, and the guesses for recently seen states are cached.  States
+    # covered by a saved decision tree are answered straight from the tree, without replaying the guesses
+    def __init__(self, hard_mode: bool = True, strategy: str = 'heuristic'):
+        self.hard_mode = hard_mode
+        self.strategy = strategy
+        self.solvers = {}
+        self.opening_book_sizes = {}
+        self.decision_trees = {}
+        self.results = OrderedDict()
+
+    def _get_solver(self, hard_mode: bool) -> WordleSolver:
+        if hard_mode not in self.solvers:
+            opening_book = WordleOpeningBook.load_book(hard_mode, strategy=self.strategy)
+            opening_book = opening_book if opening_book is not None else {}
+            self.opening_book_sizes[hard_mode] = len(opening_book)
+            self.solvers[hard_mode] = WordleSolver(hard_mode=hard_mode, suppress_output=True, strategy=self.strategy, opening_book=opening_book)
+        return self.solvers[hard_mode]
+
+    def _get_decision_tree(self, hard_mode: bool):
+        if hard_mode not in self.decision_trees:
+            self.decision_trees[hard_mode] = WordleDecisionTree.load(hard_mode, strategy=self.strategy)
+        return self.decision_trees[hard_mode]
+
+    def _trim_opening_book(self, hard_mode: bool):
+        # Drops the most recently added entries beyond the cap - never the ones loaded from the saved book
+        opening_book = self.solvers[hard_mode].opening_book
+        while len(opening_book) > self.opening_book_sizes[hard_mode] + BATCH_OPENING_BOOK_MAX_NEW_ENTRIES:
+            opening_book.popitem()
+
+    @staticmethod
+    def _parse_guess(guess: dict, word_len: int) -> (str, list, list):
+        # Raises a ValueError for anything that isn't a valid guess and feedback - a bad state must not reach the
+        # solver, whose opening book and caches are shared with every other state
+        word = str(guess['word']).strip().lower()
+        if len(word) != word_len:
+            raise ValueError("guess '{}' is not {} letters long".format(word, word_len))
+        if set(word) - set(string.ascii_lowercase):
+            raise ValueError("guess '{}' must only have letters a-z".format(word))
+
+        # Positions must be a JSON list of integers - int() would take "25" as positions 2 and 5, and true as 1
+        for color in ('yellow', 'green'):
+            positions = guess.get(color, [])
+            if not isinstance(positions, list) or any(isinstance(pos, bool) or not isinstance(pos, int) for pos in positions):
+                raise ValueError("{} positions for guess '{}' must be a list of integers".format(color, word))
+        wrongly_placed_letter_positions = list(guess.get('yellow', []))
+        correctly_placed_letter_positions = list(guess.get('green', []))
+        for pos in wrongly_placed_letter_positions + correctly_placed_letter_positions:
+            if pos < 1 or pos > word_len:
+                raise ValueError("position {} is out of range for guess '{}'".format(pos, word))
+        if len(set(wrongly_placed_letter_positions + correctly_placed_letter_positions)) != len(wrongly_placed_letter_positions) + len(correctly_placed_letter_positions):
+            raise ValueError("positions for guess '{}' must not repeat or be both YELLOW and GREEN".format(word))
+        return word, wrongly_placed_letter_positions, correctly_placed_letter_positions
+
+    def solve(self, guesses: list, hard_mode: bool = None) -> dict:
+        # Returns the next guess for the game state reached by the given guess history
+        # bool() would take the string "false" as True
+        if hard_mode is not None and not isinstance(hard_mode, bool):
+            raise ValueError("hard_mode must be true or false")
+        hard_mode = self.hard_mode if hard_mode is None else hard_mode
+        wordle_solver = self._get_solver(hard_mode)
+        word_len = WordleSolver.load_words().letter_codes.shape[1]
+        parsed_guesses = [WordleBatchSolver._parse_guess(guess, word_len) for guess in guesses]
+
+        cache_key = (hard_mode, tuple((word, tuple(sorted(yellow)), tuple(sorted(green))) for word, yellow, green in parsed_guesses))
+        if cache_key in self.results:
+            self.results.move_to_end(cache_key)
+            return self.results[cache_key]
+
+        decision_tree = self._get_decision_tree(hard_mode)
+        node = decision_tree.lookup((word, WordleFeedback.encode_feedback(yellow, green)) for word, yellow, green in parsed_guesses) if decision_tree is not None else -1
+        if node >= 0:
+            return self._cache_result(cache_key, {'guess': decision_tree.guess(node), 'remaining': decision_tree.remaining_word_count(node), 'solved': False})
+
+        wordle_solver.reset()
+        for word, wrongly_placed_letter_positions, correctly_placed_letter_positions in parsed_guesses:
+            wordle_solver.add_feedback(word, wrongly_placed_letter_positions, correctly_placed_letter_positions)
+            if wordle_solver.is_game_won(): break
+
+        if wordle_solver.is_game_won():
+            result = {'guess': None, 'remaining': 1, 'solved': True}
+        else:
+            result = {'guess': wordle_solver.next_guess(), 'remaining': len(wordle_solver.remaining_word_indices), 'solved': False}
+            self._trim_opening_book(hard_mode)
+        return self._cache_result(cache_key, result)
+
+    def _cache_result(self, cache_key: tuple, result: dict) -> dict:
+        self.results[cache_key] = result
+        while len(self.results) > BATCH_RESULT_CACHE_SIZE:
+            self.results.popitem(last=False)
+        return result
+
+    def run(self, input_stream=sys.stdin, output_stream=sys.stdout) -> int:
+        # Reads one JSON game state per line and streams back one JSON answer per line, in the same order.  Bad
+        # lines get an "error" answer instead of stopping the batch
+        error_count = 0
+        for line in input_stream:
+            if not line.strip(): continue
+
+            try:
+                state = json.loads(line)
+                result = dict(self.solve(state.get('guesses', []), state.get('hard_mode')))
+                if 'id' in state:
+                    result['id'] = state['id']
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                error_count += 1
+                result = {'error': str(e)}
+
+            output_stream.write(json.dumps(result) + '\n')
+            output_stream.flush()
+
+        return 1 if error_count else 0
@@ -0,0 +1,203 @@
+import sys
+import json
+import random
+import argparse
+import platform
+import resource
+import statistics
+import tracemalloc
+from collections import Counter
+from timeit import default_timer as timer
+
+import wordle_solver
+from wordle_solver import WordleSolver, MAX_GUESSES, optimal_score_settings
+from wordle_optimizer import WordleOptimizer
+
+# A run is flagged as a regression when a benchmark gets this much slower (or uses this much more memory) than the
+# saved baseline
+DEFAULT_TOLERANCE = 0.25
+
+# Timings below this many ms are too noisy to compare against a baseline
+MIN_COMPARABLE_MS = 0.05
+
+# Fixed game state used by the hot-path benchmarks: the state after the first guess, for this answer
+BENCHMARK_ANSWER = 'cigar'
+
+# Random games played to check the solver's word elimination before benchmarking it (about 0.15s each)
+ELIMINATION_CHECK_GAMES = 30
+
+
+class WordleBenchmark:
+    @staticmethod
+    def _time(func, setup=None, repeat: int = 20) -> dict:
+        # Times func over several runs (setup, if given, runs before each one untimed and its result is passed in),
+        # then runs it once more under tracemalloc to record its peak memory use
+        timings = []
+        for _ in range(repeat):
+            args = (setup(),) if setup else ()
+            start = timer()
+            func(*args)
+            timings.append((timer() - start) * 1000)
+
+        args = (setup(),) if setup else ()
+        tracemalloc.start()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {'median_ms': statistics.median(timings), 'min_ms': min(timings), 'runs': repeat, 'peak_kb': peak / 1024.0}
+
+    @staticmethod
+    def _new_solver(hard_mode: bool) -> WordleSolver:
+        return WordleSolver(hard_mode=hard_mode, suppress_output=True)
+
+    @staticmethod
+    def _after_first_guess(hard_mode: bool) -> WordleSolver:
+        wordle_solver = WordleBenchmark._new_solver(hard_mode)
+        best_guess = wordle_solver._make_guess()
+        wordle_solver._process_feedback(best_guess, *WordleOptimizer._calc_feedback(BENCHMARK_ANSWER, best_guess))
+        return wordle_solver
+
+    @staticmethod
+    def _load_words_cold():
+        wordle_solver.INIT_WORD_TABLE = None
+        WordleSolver.load_words()
+
+    @staticmethod
+    def _satisfies_feedback(word: str, guessed_word: str, wrongly_placed_letter_positions: list, correctly_placed_letter_positions: list) -> bool:
+        # Word-by-word version of the feedback rules the solver applies: GREEN letters must match, YELLOW letters
+        # must not be in that position, each letter must appear at least as often as it came back YELLOW or GREEN, and
+        # exactly that often if it also came back grey
+        observed_counts = Counter(letter for i, letter in enumerate(guessed_word) if i + 1 in wrongly_placed_letter_positions or i + 1 in correctly_placed_letter_positions)
+        grey_letters = set(letter for i, letter in enumerate(guessed_word) if i + 1 not in wrongly_placed_letter_positions and i + 1 not in correctly_placed_letter_positions)
+        for i, letter in enumerate(guessed_word):
+            if i + 1 in correctly_placed_letter_positions and word[i] != letter: return False
+            if i + 1 in wrongly_placed_letter_positions and word[i] == letter: return False
+        word_counts = Counter(word)
+        if any(word_counts[letter] < count for letter, count in observed_counts.items()): return False
+        return all(word_counts[letter] == observed_counts[letter] for letter in grey_letters)
+
+    @staticmethod
+    def check_elimination(games: int = ELIMINATION_CHECK_GAMES, seed: int = 0) -> list:
+        # Plays random guesses against random answers and checks the words the solver keeps after each guess (found
+        # through the word table's letter index) against a brute-force filter of the previously remaining words.
+        # Returns a description of every mismatch
+        rng = random.Random(seed)
+        word_table = WordleSolver.load_words()
+        mismatches = []
+        for _ in range(games):
+            wordle_solver = WordleBenchmark._new_solver(False)
+            answer = rng.choice(word_table.words)
+            for _ in range(MAX_GUESSES):
+                guessed_word = rng.choice(word_table.words)
+                remaining_words = wordle_solver.remaining_words
+                feedback = WordleOptimizer._calc_feedback(answer, guessed_word)
+                wordle_solver._process_feedback(guessed_word, *feedback)
+                if wordle_solver.is_game_won(): break
+
+                expected = [word for word in remaining_words if word != guessed_word and WordleBenchmark._satisfies_feedback(word, guessed_word, *feedback)]
+                if expected != wordle_solver.remaining_words:
+                    mismatches.append("answer '{}', guesses {}: {} words kept, {} expected".format(answer, [word for word, _ in wordle_solver.feedback_history], len(wordle_solver.remaining_words), len(expected)))
+                    break
+        return mismatches
+
+    @staticmethod
+    def run(hard_modes: list, repeat: int = 20, sweep: bool = True) -> dict:
+        results = {}
+        historical_words = WordleOptimizer._get_historical_words()
+        WordleSolver.load_feedback_matrix()
+
+        results['load_words_cold'] = WordleBenchmark._time(WordleBenchmark._load_words_cold, repeat=repeat)
+        results['load_words_warm'] = WordleBenchmark._time(WordleSolver.load_words, repeat=repeat)
+        results['calc_feedback'] = WordleBenchmark._time(lambda: [WordleOptimizer._calc_feedback(word, 'tares') for word in historical_words], repeat=repeat)
+
+        for hard_mode in hard_modes:
+            mode = 'hard' if hard_mode else 'easy'
+            first_guess = WordleBenchmark._new_solver(hard_mode)._make_guess()
+            feedback = WordleOptimizer._calc_feedback(BENCHMARK_ANSWER, first_guess)
+
+            results['calc_letter_and_position_scores_{}'.format(mode)] = WordleBenchmark._time(lambda s: s._calc_letter_and_position_scores(), setup=lambda: WordleBenchmark._after_first_guess(hard_mode), repeat=repeat)
+            results['calc_word_scores_first_turn_{}'.format(mode)] = WordleBenchmark._time(lambda s: s._calc_word_scores(), setup=lambda: WordleBenchmark._new_solver(hard_mode), repeat=repeat)
+            results['calc_word_scores_{}'.format(mode)] = WordleBenchmark._time(lambda s: s._calc_word_scores(), setup=lambda: WordleBenchmark._after_first_guess(hard_mode), repeat=repeat)
+            results['eliminate_words_{}'.format(mode)] = WordleBenchmark._time(lambda s: s._process_feedback(first_guess, *feedback), setup=lambda: WordleBenchmark._new_solver(hard_mode), repeat=repeat)
+            results['single_game_{}'.format(mode)] = WordleBenchmark._time(lambda: WordleOptimizer._run_simulation([BENCHMARK_ANSWER], hard_mode, *optimal_score_settings[hard_mode]), repeat=repeat)
+
+            if sweep:
+                start = timer()
+                avg_guess_count, failed_word_count = WordleOptimizer._run_simulation(historical_words, hard_mode, *optimal_score_settings[hard_mode])
+                elapsed_ms = (timer() - start) * 1000
+                results['historical_sweep_{}'.format(mode)] = {'median_ms': elapsed_ms, 'min_ms': elapsed_ms, 'runs': 1, 'avg_guess_count': avg_guess_count, 'failed_word_count': failed_word_count}
+
+        return results
+
+    @staticmethod
+    def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list:
+        # Returns a description of every benchmark that regressed against the baseline.  Timings are compared on the
+        # fastest run, which is the least sensitive to noise from other processes
+        regressions = []
+        for name, result in results.items():
+            if name not in baseline: continue
+            for metric in ('min_ms', 'peak_kb'):
+                if metric not in result or metric not in baseline[name]: continue
+                if metric == 'min_ms' and baseline[name][metric] < MIN_COMPARABLE_MS: continue
+                if result[metric] > baseline[name][metric] * (1 + tolerance):
+                    regressions.append("{} {}: {:.3f} vs baseline {:.3f} (+{:.0%})".format(name, metric, result[metric], baseline[name][metric], result[metric] / baseline[name][metric] - 1))
+
+            # Guess counts must not change at all
+            for metric in ('avg_guess_count', 'failed_word_count'):
+                if metric in result and metric in baseline[name] and result[metric] != baseline[name][metric]:
+                    regressions.append("{} {}: {} vs baseline {}".format(name, metric, result[metric], baseline[name][metric]))
+        return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the Wordle solver\'s hot paths and full historical sweeps')
+    parser.add_argument('--mode', choices=['hard', 'easy', 'both'], default='both', help='game mode(s) to benchmark (default: both)')
+    parser.add_argument('--repeat', type=int, default=20, help='number of timed runs per benchmark (default: 20)')
+    parser.add_argument('--no_sweep', dest='sweep', action='store_false', help='skip the full historical-answers sweeps')
+    parser.add_argument('--output', default=None, help='write the results as JSON to this file')
+    parser.add_argument('--baseline', default=None, help='compare against the results saved in this JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown / memory growth vs the baseline before failing (default: {})'.format(DEFAULT_TOLERANCE))
+    parser.add_argument('--check_games', type=int, default=ELIMINATION_CHECK_GAMES,
+                        help='random games to check word elimination against a brute-force filter first (default: {}, 0 to skip)'.format(ELIMINATION_CHECK_GAMES))
+    args = parser.parse_args()
+
+    mismatches = WordleBenchmark.check_elimination(args.check_games)
+    if mismatches:
+        print("\n**** WORD ELIMINATION MISMATCHES ****")
+        for mismatch in mismatches:
+            print("  " + mismatch)
+        return 1
+
+    hard_modes = {'hard': [True], 'easy': [False], 'both': [True, False]}[args.mode]
+    results = WordleBenchmark.run(hard_modes, repeat=args.repeat, sweep=args.sweep)
+
+    print("\nbenchmark\tmedian_ms\tmin_ms\tpeak_kb")
+    for name, result in results.items():
+        print("{}\t{:.3f}\t{:.3f}\t{}".format(name, result['median_ms'], result['min_ms'], '{:.1f}'.format(result['peak_kb']) if 'peak_kb' in result else '-'))
+
+    # ru_maxrss is in KB on Linux (but bytes on macOS)
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024.0 if sys.platform == 'darwin' else 1.0)
+    print("\nPeak RSS: {:.1f} MB".format(max_rss_kb / 1024.0))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': platform.python_version(), 'platform': platform.platform(), 'max_rss_kb': max_rss_kb, 'results': results}, f, indent=1, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+        regressions = WordleBenchmark.compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\n**** PERFORMANCE REGRESSIONS vs {} ****".format(args.baseline))
+            for regression in regressions:
+                print("  " + regression)
+            return 1
+        print("\nNo regressions vs {}".format(args.baseline))
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import os
+import mmap
+import struct
+import hashlib
+import numpy as np
+
+from wordle_helper import WordleHelper
+
+COMPILED_WORDS_DIR = 'resources/cache'
+COMPILED_WORDS_MAGIC = b'WRDL'
+COMPILED_WORDS_VERSION = 2
+
+# Header: magic, format version, SHA-1 of the source files, word length, # dictionary words, # bytes of historical
+# answers (padded to 48 bytes, so the arrays that follow stay 8-byte aligned)
+HEADER_FORMAT = '<4sI20sIII4x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+
+
+class WordleCompiledWords:
+    # The dictionary and historical answers compiled into a single binary file, laid out as:
+    #   header | dictionary words packed as fixed-width ASCII | padding to 8 bytes | normalized word frequencies
+    #   (float64) | historical answers (newline-separated ASCII)
+    # The file is memory-mapped and the arrays are read straight out of the mapping without copying.  It's rebuilt
+    # automatically whenever the checksum of the source files no longer matches the one in the header
+    @staticmethod
+    def _source_checksum(words_path: str, answers_path: str, word_len: int, min_frequency: int) -> bytes:
+        checksum = hashlib.sha1('{},{}'.format(word_len, min_frequency).encode('ascii'))
+        for path in (words_path, answers_path):
+            with open(os.path.join(os.getcwd(), path), 'rb') as f:
+                checksum.update(f.read())
+            checksum.update(b'\0')
+        return checksum.digest()
+
+    @staticmethod
+    def compiled_path(words_path: str, word_len: int, min_frequency: int) -> str:
+        # Each dictionary source / word length / frequency threshold gets its own compiled file
+        return os.path.join(COMPILED_WORDS_DIR, 'words_{}_{}_{}.bin'.format(os.path.splitext(os.path.basename(words_path))[0], word_len, min_frequency))
+
+    @staticmethod
+    def _frequencies_offset(word_len: int, num_words: int) -> int:
+        return HEADER_SIZE + (word_len * num_words + 7) // 8 * 8
+
+    @staticmethod
+    def compile(words_path: str = 'resources/word_frequencies.csv', answers_path: str = 'resources/historical_answers.txt', compiled_path: str = None,
+                word_len: int = 5, min_frequency: int = 0):
+        # Only the words of the given length with at least min_frequency uses are kept (a later row for the same word
+        # replaces its frequency)
+        words_and_frequencies = dict(WordleHelper.stream_words(words_path, word_len, min_frequency))
+        WordleHelper.normalize_values(words_and_frequencies, top_k=0)
+        words = list(words_and_frequencies.keys())
+        compiled_path = compiled_path or WordleCompiledWords.compiled_path(words_path, word_len, min_frequency)
+
+        with open(os.path.join(os.getcwd(), answers_path), 'r') as f:
+            historical_answers = '\n'.join(filter(None, (str(line).strip() for line in f))).encode('ascii')
+
+        packed_words = ''.join(words).encode('ascii')
+        padding = WordleCompiledWords._frequencies_offset(word_len, len(words)) - HEADER_SIZE - len(packed_words)
+        header = struct.pack(HEADER_FORMAT, COMPILED_WORDS_MAGIC, COMPILED_WORDS_VERSION, WordleCompiledWords._source_checksum(words_path, answers_path, word_len, min_frequency),
+                             word_len, len(words), len(historical_answers))
+
+        # Write to a temp file first and rename it into place so concurrent readers never see a partial file
+        compiled_path = os.path.join(os.getcwd(), compiled_path)
+        os.makedirs(os.path.dirname(compiled_path), exist_ok=True)
+        temp_path = '{}.{}.tmp'.format(compiled_path, os.getpid())
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            f.write(packed_words)
+            f.write(b'\0' * padding)
+            f.write(np.fromiter(words_and_frequencies.values(), dtype='<f8', count=len(words)).tobytes())
+            f.write(historical_answers)
+        os.replace(temp_path, compiled_path)
+
+    @staticmethod
+    def _map(compiled_path: str, checksum: bytes):
+        # Returns the memory-mapped file and its parsed header, or None if it is missing or out of date
+        if not os.path.exists(compiled_path):
+            return None
+
+        with open(compiled_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, source_checksum, word_len, num_words, answers_len = struct.unpack_from(HEADER_FORMAT, mapped)
+        if magic != COMPILED_WORDS_MAGIC or version != COMPILED_WORDS_VERSION or source_checksum != checksum:
+            mapped.close()
+            return None
+        return mapped, word_len, num_words, answers_len
+
+    @staticmethod
+    def load(words_path: str = 'resources/word_frequencies.csv', answers_path: str = 'resources/historical_answers.txt', compiled_path: str = None,
+             word_len: int = 5, min_frequency: int = 0) -> (list, np.ndarray, np.ndarray, list):
+        # Returns the dictionary words, their letter byte-codes (num_words x word_len), their normalized frequencies
+        # and the historical answers - compiling the source files first if needed
+        compiled_path = compiled_path or WordleCompiledWords.compiled_path(words_path, word_len, min_frequency)
+        checksum = WordleCompiledWords._source_checksum(words_path, answers_path, word_len, min_frequency)
+        full_path = os.path.join(os.getcwd(), compiled_path)
+        header = WordleCompiledWords._map(full_path, checksum)
+        if header is None:
+            WordleCompiledWords.compile(words_path, answers_path, compiled_path, word_len, min_frequency)
+            header = WordleCompiledWords._map(full_path, checksum)
+
+        mapped, _, num_words, answers_len = header
+        letter_codes = np.frombuffer(mapped, dtype=np.uint8, count=word_len * num_words, offset=HEADER_SIZE).reshape(num_words, word_len)
+        frequencies_offset = WordleCompiledWords._frequencies_offset(word_len, num_words)
+        frequencies = np.frombuffer(mapped, dtype='<f8', count=num_words, offset=frequencies_offset)
+
+        packed_words = mapped[HEADER_SIZE:HEADER_SIZE + word_len * num_words].decode('ascii')
+        words = [packed_words[i:i + word_len] for i in range(0, len(packed_words), word_len)]
+
+        answers_offset = frequencies_offset + 8 * num_words
+        historical_answers = mapped[answers_offset:answers_offset + answers_len].decode('ascii').split('\n') if answers_len else []
+
+        return words, letter_codes, frequencies, historical_answers
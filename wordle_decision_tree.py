@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+import numpy as np
+from collections import Counter
+
+from wordle_solver import WordleSolver, MAX_GUESSES, optimal_score_settings
+from wordle_feedback import WordleFeedback
+from wordle_optimizer import WordleOptimizer
+
+# Bump this whenever the scoring logic changes in a way that would change the guesses stored in existing trees
+DECISION_TREE_VERSION = 1
+
+DECISION_TREE_CACHE_DIR = 'resources/cache'
+
+
+class WordleDecisionTree:
+    # The solver's whole policy for a set of answers, precomputed as a tree: each node is a game state (the feedback
+    # history so far) holding the solver's guess and the # of words still remaining there, with one child per
+    # feedback pattern that guess can get back.  Games that share a prefix share the same path from the root, so each
+    # state is stored (and scored, when building) only once.
+    # The tree is kept as flat arrays - node i guesses word guesses[i], and its children are the edges
+    # edge_start[i] .. edge_start[i] + edge_count[i], sorted by feedback pattern code - so answering a turn is a
+    # couple of array lookups
+    def __init__(self, guesses: np.ndarray, remaining: np.ndarray, edge_start: np.ndarray, edge_count: np.ndarray, edge_codes: np.ndarray, edge_children: np.ndarray, metadata: dict):
+        self.guesses = guesses
+        self.remaining = remaining
+        self.edge_start = edge_start
+        self.edge_count = edge_count
+        self.edge_codes = edge_codes
+        self.edge_children = edge_children
+        self.metadata = metadata
+
+    def __len__(self) -> int:
+        return len(self.guesses)
+
+    def guess(self, node: int) -> str:
+        return WordleSolver.word_list()[self.guesses[node]]
+
+    def remaining_word_count(self, node: int) -> int:
+        return int(self.remaining[node])
+
+    def child(self, node: int, guessed_word: str, code: int) -> int:
+        # Returns the node reached from this one by the guess and its feedback, or -1 if that state isn't in the tree
+        # (including when a different word was guessed than the tree's)
+        if node < 0 or WordleSolver.word_index(guessed_word) != self.guesses[node]:
+            return -1
+
+        start, count = self.edge_start[node], self.edge_count[node]
+        pos = start + np.searchsorted(self.edge_codes[start:start + count], code)
+        if pos < start + count and self.edge_codes[pos] == code:
+            return int(self.edge_children[pos])
+        return -1
+
+    def lookup(self, feedback_history) -> int:
+        # Follows a whole (guessed word, feedback pattern code) history down from the root
+        node = 0 if len(self) else -1
+        for guessed_word, code in feedback_history:
+            node = self.child(node, guessed_word, code)
+        return node
+
+    @staticmethod
+    def _feedback_code(guess_word: str, answer: str) -> int:
+        code = WordleSolver.lookup_feedback(guess_word, answer)
+        if code is None:
+            code = WordleFeedback.encode_feedback(*WordleOptimizer._calc_feedback_direct(answer, guess_word))
+        return code
+
+    @staticmethod
+    def _expand_node(node: dict, answers: list, hard_mode: bool, score_settings: tuple, strategy: str, feedback_history: list, guess_counts: dict, failed_words: list):
+        # Replay the feedback history to reach this game state and make the solver's guess there, then split the
+        # answers that reach this state by the feedback they give that guess
+        wordle_solver = WordleSolver(hard_mode, *score_settings, suppress_output=True, strategy=strategy)
+        for guessed_word, code in feedback_history:
+            wordle_solver.add_feedback(guessed_word, *WordleFeedback.decode_feedback(code, len(guessed_word)))
+
+        best_guess = wordle_solver.next_guess()
+        if not best_guess:
+            failed_words.extend(answers)
+            return
+        node['guess'] = best_guess
+        node['remaining'] = len(wordle_solver.remaining_word_indices)
+
+        partitions = {}
+        for answer in answers:
+            if answer == best_guess:
+                guess_counts[answer] = len(feedback_history) + 1
+            elif len(feedback_history) + 1 >= MAX_GUESSES:
+                failed_words.append(answer)
+            else:
+                partitions.setdefault(WordleDecisionTree._feedback_code(best_guess, answer), []).append(answer)
+
+        for code, partition in sorted(partitions.items()):
+            node['children'][code] = {'children': {}}
+            WordleDecisionTree._expand_node(node['children'][code], partition, hard_mode, score_settings, strategy, feedback_history + [(best_guess, code)], guess_counts, failed_words)
+
+        # Drop children where no guess could be made (their answers were counted as failed)
+        node['children'] = {code: child for code, child in node['children'].items() if 'guess' in child}
+
+    @staticmethod
+    def build_tree(hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic', answers: list = None) -> ('WordleDecisionTree', dict, list):
+        # Plays the solver's policy against every answer (the historical answers by default) and records every state
+        # reached.  Returns the tree, the # of guesses taken for each solved answer and the answers that couldn't be
+        # solved
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        answers = list(answers) if answers is not None else WordleOptimizer._get_historical_words()
+        WordleSolver.load_feedback_matrix()
+
+        root = {'children': {}}
+        guess_counts = {}
+        failed_words = []
+        WordleDecisionTree._expand_node(root, answers, hard_mode, score_settings, strategy, [], guess_counts, failed_words)
+
+        # Flatten the nested nodes breadth-first, so every node's children are stored next to each other
+        nodes = [root] if 'guess' in root else []
+        guesses, remaining, edge_start, edge_count, edge_codes, edge_children = [], [], [], [], [], []
+        for node in nodes:
+            guesses.append(WordleSolver.word_index(node['guess']))
+            remaining.append(node['remaining'])
+            edge_start.append(len(edge_codes))
+            edge_count.append(len(node['children']))
+            for code, child in sorted(node['children'].items()):
+                edge_codes.append(code)
+                edge_children.append(len(nodes))
+                nodes.append(child)
+
+        metadata = {
+            'version': DECISION_TREE_VERSION, 'hard_mode': hard_mode, 'strategy': strategy, 'score_settings': list(score_settings),
+            'word_list_hash': WordleFeedback.word_list_hash(WordleSolver.word_list()), 'answer_count': len(answers)
+        }
+        word_len = len(WordleSolver.word_list()[0])
+        tree = WordleDecisionTree(np.array(guesses, dtype=np.int32), np.array(remaining, dtype=np.int32), np.array(edge_start, dtype=np.int32),
+                                  np.array(edge_count, dtype=np.int32), np.array(edge_codes, dtype=WordleFeedback.pattern_dtype(word_len)),
+                                  np.array(edge_children, dtype=np.int32), metadata)
+        return tree, guess_counts, failed_words
+
+    def depth(self) -> int:
+        # The most guesses made along any path from the root
+        if not len(self): return 0
+        depths = np.zeros(len(self), dtype=np.int32)
+        depths[0] = 1
+        for node in range(len(self)):
+            start, count = self.edge_start[node], self.edge_count[node]
+            depths[self.edge_children[start:start + count]] = depths[node] + 1
+        return int(depths.max())
+
+    @staticmethod
+    def print_report(tree: 'WordleDecisionTree', guess_counts: dict, failed_words: list):
+        distribution = Counter(guess_counts.values())
+        print("\n*** Decision tree: {} nodes, depth {}, {} answers ***".format(len(tree), tree.depth(), len(guess_counts) + len(failed_words)))
+        if guess_counts:
+            print("Worst case: {} guesses, avg guess count: {:.4f}".format(max(guess_counts.values()), sum(guess_counts.values()) / float(len(guess_counts))))
+            print("Guess count distribution: {}".format(', '.join('{}: {}'.format(guess_count, distribution[guess_count]) for guess_count in sorted(distribution))))
+        print("Failed words ({}): {}".format(len(failed_words), ' '.join(failed_words)))
+
+    @staticmethod
+    def _tree_path(hard_mode: bool, score_settings: tuple, strategy: str, cache_dir: str = DECISION_TREE_CACHE_DIR) -> str:
+        # A tree built for the whole dictionary covers every path of one built for the historical answers, so both
+        # share the same file
+        key = json.dumps([DECISION_TREE_VERSION, hard_mode, strategy, list(score_settings), WordleFeedback.word_list_hash(WordleSolver.word_list())])
+        tree_hash = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(os.getcwd(), cache_dir, 'decision_tree_{}_{}_{}.npz'.format('hard' if hard_mode else 'easy', strategy, tree_hash))
+
+    def save(self) -> str:
+        tree_path = WordleDecisionTree._tree_path(self.metadata['hard_mode'], tuple(self.metadata['score_settings']), self.metadata['strategy'])
+        os.makedirs(os.path.dirname(tree_path), exist_ok=True)
+
+        # Write to a temp file first and rename it into place so concurrent readers never see a partial file
+        temp_path = '{}.{}.tmp.npz'.format(tree_path[:-len('.npz')], os.getpid())
+        np.savez_compressed(temp_path, guesses=self.guesses, remaining=self.remaining, edge_start=self.edge_start, edge_count=self.edge_count,
+                            edge_codes=self.edge_codes, edge_children=self.edge_children, metadata=np.array(json.dumps(self.metadata)))
+        os.replace(temp_path, tree_path)
+        return tree_path
+
+    @staticmethod
+    def load(hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic'):
+        # Returns the saved tree for this mode, strategy and parameter set, or None if one hasn't been built
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        tree_path = WordleDecisionTree._tree_path(hard_mode, score_settings, strategy)
+        if not os.path.exists(tree_path):
+            return None
+
+        with np.load(tree_path) as saved_tree:
+            metadata = json.loads(str(saved_tree['metadata']))
+            if metadata.get('version') != DECISION_TREE_VERSION or metadata.get('word_list_hash') != WordleFeedback.word_list_hash(WordleSolver.word_list()):
+                return None
+            return WordleDecisionTree(saved_tree['guesses'], saved_tree['remaining'], saved_tree['edge_start'], saved_tree['edge_count'],
+                                      saved_tree['edge_codes'], saved_tree['edge_children'], metadata)
@@ -0,0 +1,157 @@
+import os
+import json
+from collections import Counter
+from timeit import default_timer as timer
+
+from wordle_solver import WordleSolver, optimal_score_settings
+from wordle_feedback import WordleFeedback
+from wordle_optimizer import WordleOptimizer
+from wordle_opening_book import WordleOpeningBook
+
+EVALUATION_CONFIG_FILE = 'evaluation.json'
+EVALUATION_RESULTS_FILE = 'results.json'
+
+# Checkpoint files are fsync'ed after this many words (every line is flushed regardless)
+CHECKPOINT_SYNC_INTERVAL = 50
+
+
+class WordleEvaluation:
+    # Evaluates the solver against every dictionary word (or the historical answers), split into shards that can be
+    # run independently - by separate processes or machines - out of one shared directory:
+    #   evaluation.json           the settings being evaluated, written by the first shard to start (every other shard
+    #                             must match them)
+    #   shard_<i>_of_<n>.jsonl    one {"word", "guess_count"} line per finished word (guess_count 0 = failed), so an
+    #                             interrupted shard picks up where it stopped when run again
+    #   results.json              written by merge() once every shard is done
+    @staticmethod
+    def _answers(answer_set: str) -> list:
+        return list(WordleSolver.word_list()) if answer_set == 'dictionary' else WordleOptimizer._get_historical_words()
+
+    @staticmethod
+    def _shard_path(eval_dir: str, shard_index: int, shard_count: int) -> str:
+        return os.path.join(eval_dir, 'shard_{:04d}_of_{:04d}.jsonl'.format(shard_index, shard_count))
+
+    @staticmethod
+    def _init_config(eval_dir: str, config: dict) -> dict:
+        # Creates the evaluation's config, or checks it against the one an earlier shard already wrote
+        os.makedirs(eval_dir, exist_ok=True)
+        config_path = os.path.join(eval_dir, EVALUATION_CONFIG_FILE)
+        try:
+            # Exclusive create, so two shards starting at once can't both write it
+            with open(config_path, 'x') as f:
+                json.dump(config, f, indent=1, sort_keys=True)
+            return config
+        except FileExistsError:
+            pass
+
+        with open(config_path, 'r') as f:
+            saved_config = json.load(f)
+        if saved_config != config:
+            raise ValueError("{} holds an evaluation with different settings: {}".format(eval_dir, json.dumps(saved_config, sort_keys=True)))
+        return saved_config
+
+    @staticmethod
+    def _read_shard(shard_path: str) -> dict:
+        # Returns word -> guess count for every word checkpointed so far (a line cut short by a crash is ignored, and
+        # that word is simply played again)
+        results = {}
+        if not os.path.exists(shard_path):
+            return results
+
+        with open(shard_path, 'r') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                    results[result['word']] = int(result['guess_count'])
+                except (ValueError, KeyError, TypeError):
+                    continue
+        return results
+
+    @staticmethod
+    def run_shard(eval_dir: str, shard_index: int, shard_count: int, hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic',
+                  answer_set: str = 'dictionary') -> int:
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError("shard {} is out of range for {} shards".format(shard_index, shard_count))
+
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        answers = WordleEvaluation._answers(answer_set)
+        WordleEvaluation._init_config(eval_dir, {
+            'hard_mode': hard_mode, 'strategy': strategy, 'score_settings': list(score_settings), 'answer_set': answer_set, 'shard_count': shard_count,
+            'word_list_hash': WordleFeedback.word_list_hash(answers)
+        })
+        WordleOptimizer._init_worker()
+
+        # Words are dealt out round-robin, so every shard gets a similar mix
+        shard_words = answers[shard_index::shard_count]
+        shard_path = WordleEvaluation._shard_path(eval_dir, shard_index, shard_count)
+        done_words = WordleEvaluation._read_shard(shard_path)
+        remaining_words = [word for word in shard_words if word not in done_words]
+        print("\n*** Evaluating shard {} of {} - {} words, {} already done ***".format(shard_index, shard_count, len(shard_words), len(shard_words) - len(remaining_words)))
+
+        opening_book = WordleOpeningBook.load_book(hard_mode, score_settings, strategy)
+        opening_book = opening_book if opening_book is not None else {}
+
+        start = timer()
+        played_count = 0
+        try:
+            with open(shard_path, 'a+') as f:
+                # End any line cut short by a crash, so it doesn't run into the next result
+                if f.tell() > 0:
+                    f.seek(f.tell() - 1)
+                    if f.read(1) != '\n':
+                        f.write('\n')
+
+                for word in remaining_words:
+                    guess_count = WordleOptimizer._play_game(word, hard_mode, *score_settings, strategy=strategy, opening_book=opening_book)
+                    f.write(json.dumps({'word': word, 'guess_count': guess_count}) + '\n')
+                    f.flush()
+
+                    played_count += 1
+                    if played_count % CHECKPOINT_SYNC_INTERVAL == 0:
+                        os.fsync(f.fileno())
+                        print("{} / {} words ({:.1f}s)".format(len(shard_words) - len(remaining_words) + played_count, len(shard_words), timer() - start), flush=True)
+
+        except (InterruptedError, KeyboardInterrupt):
+            print("\n*** Interrupted - {} words checkpointed, run the shard again to resume ***".format(len(shard_words) - len(remaining_words) + played_count))
+            return 1
+
+        print("\n*** Shard {} of {} done - played {} words in {:.1f}s ***".format(shard_index, shard_count, played_count, timer() - start))
+        return 0
+
+    @staticmethod
+    def merge(eval_dir: str) -> dict:
+        # Combines the shard checkpoints into the guess-count distribution and the list of failed words.  Raises a
+        # ValueError listing the shards that aren't done yet
+        with open(os.path.join(eval_dir, EVALUATION_CONFIG_FILE), 'r') as f:
+            config = json.load(f)
+        answers = WordleEvaluation._answers(config['answer_set'])
+        if WordleFeedback.word_list_hash(answers) != config['word_list_hash']:
+            raise ValueError("the word list has changed since the evaluation in {} was started".format(eval_dir))
+
+        results = {}
+        incomplete_shards = []
+        for shard_index in range(config['shard_count']):
+            shard_results = WordleEvaluation._read_shard(WordleEvaluation._shard_path(eval_dir, shard_index, config['shard_count']))
+            missing_count = sum(1 for word in answers[shard_index::config['shard_count']] if word not in shard_results)
+            if missing_count:
+                incomplete_shards.append('{} ({} words left)'.format(shard_index, missing_count))
+            results.update(shard_results)
+        if incomplete_shards:
+            raise ValueError("shards not finished yet: {}".format(', '.join(incomplete_shards)))
+
+        guess_counts = [results[word] for word in answers if results[word]]
+        failed_words = [word for word in answers if not results[word]]
+        summary = dict(config, word_count=len(answers), solved_count=len(guess_counts), failed_words=failed_words,
+                       avg_guess_count=sum(guess_counts) / float(len(guess_counts)) if guess_counts else 0.0,
+                       guess_count_distribution={str(guess_count): count for guess_count, count in sorted(Counter(guess_counts).items())})
+
+        with open(os.path.join(eval_dir, EVALUATION_RESULTS_FILE), 'w') as f:
+            json.dump(summary, f, indent=1, sort_keys=True)
+        return summary
+
+    @staticmethod
+    def print_summary(summary: dict):
+        print("\n*** Evaluation - {} mode, {} strategy, {} words ***".format('HARD' if summary['hard_mode'] else 'EASY', summary['strategy'], summary['word_count']))
+        print("Solved: {}, avg guess count: {:.4f}".format(summary['solved_count'], summary['avg_guess_count']))
+        print("Guess count distribution: {}".format(', '.join('{}: {}'.format(guess_count, count) for guess_count, count in summary['guess_count_distribution'].items())))
+        print("Failed words ({}): {}".format(len(summary['failed_words']), ' '.join(summary['failed_words'])))
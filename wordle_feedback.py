@@ -0,0 +1,163 @@
+import os
+import hashlib
+import numpy as np
+
+# Feedback for a single (guess, answer) pair is encoded as one base-3 number - one digit per letter position
+# (position i is worth 3^i), where each digit is 0 for GREY, 1 for YELLOW and 2 for GREEN
+GREY, YELLOW, GREEN = 0, 1, 2
+
+FEEDBACK_CACHE_DIR = 'resources/cache'
+
+# Number of guess rows to compute per vectorized block when building the matrix (bounds peak memory use)
+BUILD_CHUNK_SIZE = 256
+
+# Max number of (guess, answer) cells to tally per block when counting feedback patterns
+PATTERN_COUNT_BLOCK_SIZE = 1 << 22
+
+# Longest words supported - their pattern codes (up to 3^15) still fit in an int32
+MAX_WORD_LEN = 15
+
+# Above this many possible feedback patterns, sum_group_scores tallies each guess's group sizes instead of tabulating
+# every pattern
+MAX_PATTERN_COUNT_COLUMNS = 3 ** 6
+
+# Largest feedback pattern matrix to build - bigger dictionaries compute their feedback patterns on the fly instead
+MAX_PATTERN_MATRIX_BYTES = 512 * 1024 * 1024
+
+PATTERN_MATRIX_CACHE = {}
+
+
+class WordleFeedback:
+    @staticmethod
+    def encode_words(words: list) -> np.ndarray:
+        # Pack the words into a (num_words x word_len) array of byte values so letters can be compared element-wise
+        if len(words) <= 0: return np.zeros((0, 0), dtype=np.uint8)
+        return np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8).reshape(len(words), len(words[0]))
+
+    @staticmethod
+    def pattern_dtype(word_len: int) -> type:
+        num_patterns = 3 ** word_len
+        return np.uint8 if num_patterns <= 1 << 8 else (np.uint16 if num_patterns <= 1 << 16 else np.uint32)
+
+    @staticmethod
+    def calc_pattern_codes(guesses: np.ndarray, answers: np.ndarray) -> np.ndarray:
+        # Computes the feedback pattern code for every (guess, answer) pair -> returns a (num_guesses x num_answers)
+        # matrix.  Mirrors the duplicate-letter rules of the game: GREEN letters are matched first, then each
+        # remaining guess letter is YELLOW only while unmatched copies of that letter are still left in the answer
+        word_len = guesses.shape[1]
+        dtype = WordleFeedback.pattern_dtype(word_len)
+        green = [guesses[:, i, None] == answers[None, :, i] for i in range(word_len)]
+        codes = np.zeros((guesses.shape[0], answers.shape[0]), dtype=dtype)
+
+        for i in range(word_len):
+            # Number of copies of this guess letter found in the non-GREEN positions of the answer
+            available = np.zeros(codes.shape, dtype=np.uint8)
+            for k in range(word_len):
+                available += (guesses[:, i, None] == answers[None, :, k]) & ~green[k]
+
+            # Number of copies of this guess letter appearing earlier in the non-GREEN positions of the guess - each
+            # one consumes one of the available copies before this position gets a chance to be marked YELLOW
+            consumed = np.zeros(codes.shape, dtype=np.uint8)
+            for j in range(i):
+                consumed += (guesses[:, j] == guesses[:, i])[:, None] & ~green[j]
+
+            yellow = ~green[i] & (available > consumed)
+            codes += (green[i] * GREEN + yellow * YELLOW).astype(dtype) * dtype(3 ** i)
+
+        return codes
+
+    @staticmethod
+    def word_list_hash(words: list) -> str:
+        return hashlib.sha1('\n'.join(words).encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def load_pattern_matrix(words: list, cache_dir: str = FEEDBACK_CACHE_DIR) -> np.ndarray:
+        # Returns the (guess x answer) feedback pattern matrix for the given word list.  The matrix is stored on disk
+        # keyed by a hash of the word list and memory-mapped, so only the first run pays the cost of building it.
+        # Returns None if the matrix would be larger than MAX_PATTERN_MATRIX_BYTES
+        if len(words) ** 2 * np.dtype(WordleFeedback.pattern_dtype(len(words[0]) if words else 0)).itemsize > MAX_PATTERN_MATRIX_BYTES:
+            return None
+
+        key = WordleFeedback.word_list_hash(words)
+        if key in PATTERN_MATRIX_CACHE:
+            return PATTERN_MATRIX_CACHE[key]
+
+        matrix_path = os.path.join(os.getcwd(), cache_dir, 'feedback_{}.npy'.format(key))
+        if not os.path.exists(matrix_path):
+            WordleFeedback._build_pattern_matrix(words, matrix_path)
+
+        PATTERN_MATRIX_CACHE[key] = np.load(matrix_path, mmap_mode='r')
+        return PATTERN_MATRIX_CACHE[key]
+
+    @staticmethod
+    def _build_pattern_matrix(words: list, matrix_path: str):
+        encoded_words = WordleFeedback.encode_words(words)
+        os.makedirs(os.path.dirname(matrix_path), exist_ok=True)
+
+        # Write to a temp file first and rename it into place so concurrent readers never see a partial matrix
+        temp_path = '{}.{}.tmp'.format(matrix_path, os.getpid())
+        matrix = np.lib.format.open_memmap(temp_path, mode='w+', shape=(len(words), len(words)), dtype=WordleFeedback.pattern_dtype(encoded_words.shape[1]))
+        for start in range(0, len(words), BUILD_CHUNK_SIZE):
+            matrix[start:start + BUILD_CHUNK_SIZE] = WordleFeedback.calc_pattern_codes(encoded_words[start:start + BUILD_CHUNK_SIZE], encoded_words)
+        matrix.flush()
+        del matrix
+        os.replace(temp_path, matrix_path)
+
+    @staticmethod
+    def sum_group_scores(pattern_matrix: np.ndarray, guess_indices: np.ndarray, answer_indices: np.ndarray, word_len: int, group_score, letter_codes: np.ndarray = None) -> np.ndarray:
+        # Returns, for each guess, the sum of group_score over the groups the guess would split the answers into by
+        # feedback pattern.  group_score maps an array of group sizes to an array of scores, and must score an empty
+        # group 0.  Without a pattern matrix, the patterns are computed from the words' letter codes instead.
+        # The guesses are tallied a block at a time: for up to MAX_PATTERN_COUNT_COLUMNS patterns as a (guesses x
+        # patterns) table of group sizes, and beyond that (longer words) as each guess's group sizes padded with zeros
+        num_patterns = 3 ** word_len
+        num_answers = len(answer_indices)
+        scores = None
+        chunk_size = max(1, PATTERN_COUNT_BLOCK_SIZE // max(1, num_answers, min(num_patterns, MAX_PATTERN_COUNT_COLUMNS + 1)))
+
+        for start in range(0, len(guess_indices), chunk_size):
+            if pattern_matrix is not None:
+                codes = pattern_matrix[np.ix_(guess_indices[start:start + chunk_size], answer_indices)].astype(np.int32)
+            else:
+                codes = WordleFeedback.calc_pattern_codes(letter_codes[guess_indices[start:start + chunk_size]], letter_codes[answer_indices]).astype(np.int32)
+
+            if num_patterns <= MAX_PATTERN_COUNT_COLUMNS:
+                # Offset each row's pattern codes so a single bincount tallies every row of the block at once
+                num_groups = num_patterns
+            else:
+                # Sort each row so equal patterns are adjacent, and number the runs of equal patterns within the row
+                num_groups = max(1, num_answers)
+                codes = np.sort(codes, axis=1)
+                new_group = np.ones(codes.shape, dtype=bool)
+                new_group[:, 1:] = codes[:, 1:] != codes[:, :-1]
+                codes = (np.cumsum(new_group, axis=1) - 1).astype(np.int32)
+            codes += (np.arange(codes.shape[0], dtype=np.int32) * num_groups)[:, None]
+            counts = np.bincount(codes.ravel(), minlength=codes.shape[0] * num_groups).reshape(codes.shape[0], num_groups)
+
+            block_scores = group_score(counts).sum(axis=1)
+            if scores is None:
+                scores = np.zeros(len(guess_indices), dtype=block_scores.dtype)
+            scores[start:start + codes.shape[0]] = block_scores
+        return scores if scores is not None else np.zeros(len(guess_indices))
+
+    @staticmethod
+    def encode_feedback(wrongly_placed_letter_positions, correctly_placed_letter_positions) -> int:
+        # Positions start from 1, as entered by the user when playing the game
+        code = 0
+        for pos in wrongly_placed_letter_positions:
+            code += YELLOW * 3 ** (pos - 1)
+        for pos in correctly_placed_letter_positions:
+            code += GREEN * 3 ** (pos - 1)
+        return code
+
+    @staticmethod
+    def decode_feedback(code: int, word_len: int) -> (list, list):
+        wrongly_placed_letter_positions = []
+        correctly_placed_letter_positions = []
+        for i in range(word_len):
+            code, digit = divmod(int(code), 3)
+            if digit == YELLOW:
+                wrongly_placed_letter_positions.append(i + 1)
+            elif digit == GREEN:
+                correctly_placed_letter_positions.append(i + 1)
+        return wrongly_placed_letter_positions, correctly_placed_letter_positions
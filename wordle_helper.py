@@ -1,23 +1,32 @@
 import os
+import re
+import mmap
+import heapq
+import numpy as np
 from collections import defaultdict
 
 
 class WordleHelper:
     @staticmethod
-    def load_words(path: str = 'resources/word_frequencies.csv') -> defaultdict:
-        english_word_frequencies = defaultdict(int)
-
-        # Load the word-frequency dictionary
+    def stream_words(path: str, word_len: int, min_frequency: int = 0):
+        # Yields the (word, frequency) rows of a word-frequency CSV that have a word_len letter word (letters a-z, in
+        # either case - the words are lower-cased) and a frequency of at least min_frequency.  The file is memory-mapped and scanned with a regex that only
+        # matches rows of the right length, so the rows that are skipped (including any header row) never become
+        # Python objects - which keeps loading a large dictionary for one word length cheap
+        row_pattern = re.compile(rb'^([a-zA-Z]{%d}),(\d+)\r?$' % word_len, re.MULTILINE)
         dict_path = os.path.join(os.getcwd(), path)
-        with open(dict_path, 'r') as f:
-            for i, line in enumerate(f):
-                word, freq = str(line).strip().split(sep=',')
-                english_word_frequencies[word] = int(freq)
-
-        return english_word_frequencies
+        with open(dict_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size <= 0: return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                for match in row_pattern.finditer(mapped):
+                    freq = int(match.group(2))
+                    if freq >= min_frequency:
+                        yield match.group(1).decode('ascii').lower(), freq
 
     @staticmethod
-    def normalize_values(d: dict, max_value: int = None, norm_to_middle=False) -> (defaultdict, list):
+    def normalize_values(d: dict, max_value: int = None, norm_to_middle=False, top_k: int = None) -> (defaultdict, list):
+        # Also returns the items sorted by (normalized) value, highest first - limited to the top K items if top_k is
+        # given, so callers that only print a few of them (or none, with top_k=0) don't pay for a full sort
         if len(d) <= 0: return d, []
 
         if norm_to_middle:
@@ -32,21 +41,36 @@ class WordleHelper:
                 #  can be eliminated on each subsequent guess
                 d[k] = 1.0 - (2 * abs(d[k] - 0.5))
 
-            # Sort the values in the dict and take the max in order to normalize
-            sorted_items = sorted(d.items(), key=lambda item: item[1], reverse=True)
-            return d, sorted_items
+            return d, WordleHelper.sorted_items(d, top_k)
 
         else:
-            # Sort the values in the dict and take the max in order to normalize
-            sorted_items = sorted(d.items(), key=lambda item: item[1], reverse=True)
+            # Take the max in order to normalize
             if not max_value:
-                max_value = sorted_items[0][1]
+                max_value = max(d.values())
 
             # Normalize values in the dict
             for k in d.keys():
                 d[k] /= max_value
 
-            return d, sorted_items
+            return d, WordleHelper.sorted_items(d, top_k)
+
+    @staticmethod
+    def sorted_items(d: dict, top_k: int = None) -> list:
+        # Items sorted by value, highest first (ties keep their dict order, same as a stable sort)
+        if top_k is None:
+            return sorted(d.items(), key=lambda item: item[1], reverse=True)
+        return heapq.nlargest(top_k, d.items(), key=lambda item: item[1])
+
+    @staticmethod
+    def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+        # Returns the indices of the K highest positive scores, highest first - ties are ordered by index, the same
+        # as a stable sort over all the scores would order them
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > k:
+            # Keep everything scoring at least as high as the Kth best, so no tied scores are lost before sorting
+            kth_best_score = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+            candidates = candidates[scores[candidates] >= kth_best_score]
+        return candidates[np.lexsort((candidates, -scores[candidates]))][:k]
 
     @staticmethod
     def print_top_k(scores, label, k=3, suppress_output=False):
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+class WordleLetterIndex:
+    # Inverted index over the dictionary, built once from the word table's letter codes:
+    #   - a posting list (sorted word indices) of the words with each letter at each position, and of the words with
+    #     at least k copies of each letter
+    #   - the same sets as bitmaps (one bit per dictionary word), to test a set of candidate words against them
+    # Feedback then narrows a set of words down by starting from the smallest posting list that every match has to
+    # be in, and testing just those words against the remaining constraints - so the cost depends on how few words can
+    # match rather than on the size of the dictionary
+    def __init__(self, letter_codes: np.ndarray, occurrence: np.ndarray):
+        num_words, word_len = letter_codes.shape
+        self.num_words = num_words
+        self.word_len = word_len
+
+        # Only letters that actually appear get a slot in the bitmaps
+        letters = np.unique(letter_codes)
+        self.letter_slots = np.full(256, -1, dtype=np.int64)
+        self.letter_slots[letters] = np.arange(len(letters))
+
+        # Posting lists are stored back to back per row, with row r's list for letter code c at
+        # postings[r][offsets[r][c]:offsets[r][c + 1]].  Rows 0 .. word_len-1 are positions; count rows are indexed by
+        # k - 1 for "at least k copies"
+        self.position_postings, self.position_offsets = [], []
+        self.count_postings, self.count_offsets = [], []
+        self.position_bitmaps = np.zeros((word_len, len(letters), (num_words + 7) // 8), dtype=np.uint8)
+        self.count_bitmaps = np.zeros((word_len, len(letters), (num_words + 7) // 8), dtype=np.uint8)
+
+        all_word_indices = np.arange(num_words)
+        for i in range(word_len):
+            # A stable sort by letter keeps each letter's word indices in order
+            order = np.argsort(letter_codes[:, i], kind='stable')
+            self.position_postings.append(order)
+            self.position_offsets.append(np.searchsorted(letter_codes[order, i], np.arange(257)))
+            self.position_bitmaps[i] = self._bitmaps(letter_codes[:, i], all_word_indices)
+
+        for k in range(1, word_len + 1):
+            # Each word holds the kth copy of a letter in at most one position
+            word_indices, positions = np.nonzero(occurrence == k)
+            codes = letter_codes[word_indices, positions]
+            order = np.lexsort((word_indices, codes))
+            self.count_postings.append(word_indices[order])
+            self.count_offsets.append(np.searchsorted(codes[order], np.arange(257)))
+            self.count_bitmaps[k - 1] = self._bitmaps(codes, word_indices)
+
+    def _bitmaps(self, codes: np.ndarray, word_indices: np.ndarray) -> np.ndarray:
+        # One packed bitmap per letter slot, with the bit set for each word index paired with that letter
+        bits = np.zeros((len(self.position_bitmaps[0]), self.position_bitmaps.shape[2] * 8), dtype=bool)
+        bits[self.letter_slots[codes], word_indices] = True
+        return np.packbits(bits, axis=1, bitorder='little')
+
+    def letter_slot(self, letter: str) -> int:
+        # The letter's slot in the bitmaps, or -1 if no dictionary word has it (including any code above 255, which
+        # the letter codes can't hold)
+        code = ord(letter)
+        return int(self.letter_slots[code]) if code < len(self.letter_slots) else -1
+
+    def position_posting(self, position: int, code: int) -> np.ndarray:
+        if code >= len(self.letter_slots): return self.position_postings[position][:0]
+        return self.position_postings[position][self.position_offsets[position][code]:self.position_offsets[position][code + 1]]
+
+    def count_posting(self, code: int, min_count: int) -> np.ndarray:
+        if min_count > self.word_len or code >= len(self.letter_slots): return self.count_postings[0][:0]
+        return self.count_postings[min_count - 1][self.count_offsets[min_count - 1][code]:self.count_offsets[min_count - 1][code + 1]]
+
+    def matching_words(self, indices: np.ndarray, correctly_placed_letters: list, incorrectly_placed_letters: list, required_letter_counts_min: list,
+                       required_letter_counts_exact: list) -> np.ndarray:
+        # Returns the (sorted) subset of the given sorted word indices that satisfies the constraints - lists of
+        # (position, letter) pairs for the GREEN and YELLOW letters, and (letter, count) pairs for the minimum and
+        # exact # of copies of letters
+        required_postings = [self.position_posting(i, ord(letter)) for i, letter in correctly_placed_letters]
+        required_postings += [self.count_posting(ord(letter), count) for letter, count in list(required_letter_counts_min) + list(required_letter_counts_exact) if count > 0]
+
+        # Start from the smallest set every matching word must be in - unless there are even fewer words to check
+        candidates = indices
+        smallest_posting = min(required_postings, key=len) if required_postings else None
+        if smallest_posting is not None and len(smallest_posting) < len(indices):
+            if len(indices) == self.num_words:
+                candidates = smallest_posting
+            else:
+                positions = np.searchsorted(indices, smallest_posting)
+                candidates = smallest_posting[indices[np.minimum(positions, len(indices) - 1)] == smallest_posting] if len(indices) else indices
+        if len(candidates) <= 0:
+            return candidates
+
+        # Test the candidates' bits in each of the constraint bitmaps
+        candidate_bytes = candidates >> 3
+        candidate_bits = (candidates & 7).astype(np.uint8)
+
+        def in_bitmap(bitmap: np.ndarray) -> np.ndarray:
+            return ((bitmap[candidate_bytes] >> candidate_bits) & 1).astype(bool)
+
+        mask = np.ones(len(candidates), dtype=bool)
+        for i, letter in correctly_placed_letters:
+            slot = self.letter_slot(letter)
+            if slot < 0: return candidates[:0]
+            mask &= in_bitmap(self.position_bitmaps[i, slot])
+        for i, letter in incorrectly_placed_letters:
+            slot = self.letter_slot(letter)
+            if slot >= 0:
+                mask &= ~in_bitmap(self.position_bitmaps[i, slot])
+
+        # "Exactly n copies" is at least n copies and not at least n + 1
+        for letter, count in list(required_letter_counts_min) + list(required_letter_counts_exact):
+            slot = self.letter_slot(letter)
+            if count > self.word_len or (slot < 0 and count > 0): return candidates[:0]
+            if slot >= 0 and count > 0:
+                mask &= in_bitmap(self.count_bitmaps[count - 1, slot])
+        for letter, count in required_letter_counts_exact:
+            slot = self.letter_slot(letter)
+            if slot >= 0 and count < self.word_len:
+                mask &= ~in_bitmap(self.count_bitmaps[count, slot])
+
+        return candidates[mask]
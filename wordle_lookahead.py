@@ -0,0 +1,143 @@
+import math
+import numpy as np
+from timeit import default_timer as timer
+
+from wordle_feedback import WordleFeedback
+from wordle_word_table import WordleWordTable
+
+# Settings for the 'lookahead' guess strategy:
+#   budget_ms  wall time allowed for the search on each move - the best guess found when it runs out is played
+#   top_n      # of guesses explored at each game state (the top N by heuristic score for the current turn, and by
+#              expected remaining words further down)
+#   depth      # of guesses looked ahead (1 or 2 is plenty - each extra level multiplies the work by about top_n)
+lookahead_settings = {
+    'budget_ms': 50.0,
+    'top_n': 8,
+    'depth': 2
+}
+
+# Expected bits of information per guess, used to estimate the guesses still needed past the search depth
+LEAF_BITS_PER_GUESS = 4.0
+
+# Max # of memoized subtree results kept before the memo is cleared
+LOOKAHEAD_MEMO_MAX_ENTRIES = 200000
+
+LOOKAHEAD_MEMO = {}
+
+
+class LookaheadBudgetExceeded(Exception):
+    pass
+
+
+class WordleLookahead:
+    # Anytime search over the feedback partitions of the top-scoring guesses: a guess is valued by the expected # of
+    # guesses it takes to solve the game (itself included), averaged over the groups of remaining words each feedback
+    # pattern would leave.  Each group is valued by searching its own best guesses one level further down, until the
+    # depth runs out and the guesses still needed are estimated from the group's size.
+    # The search deepens one level at a time, and stops as soon as the per-move budget is spent - keeping the best
+    # guess from the deepest level any guess was fully searched to.  Group results are memoized across moves (and
+    # games) keyed by the group's words, as they don't depend on how the game got there
+    def __init__(self, word_table: WordleWordTable, feedback_matrix: np.ndarray, budget_ms: float = None, top_n: int = None, depth: int = None):
+        self.word_table = word_table
+        self.feedback_matrix = feedback_matrix
+        self.budget_ms = budget_ms if budget_ms is not None else lookahead_settings['budget_ms']
+        self.top_n = top_n if top_n is not None else lookahead_settings['top_n']
+        self.depth = depth if depth is not None else lookahead_settings['depth']
+        self.deadline = None
+        self.evaluated_count = 0
+
+    @staticmethod
+    def clear_memo():
+        LOOKAHEAD_MEMO.clear()
+
+    @staticmethod
+    def estimate_guesses(word_count: int) -> float:
+        # Estimated guesses to solve a game with this many words left: a 1 in N chance of guessing it right away,
+        # otherwise at least one more guess plus about LEAF_BITS_PER_GUESS bits narrowed down per guess after that
+        if word_count <= 1: return float(word_count)
+        return 1.0 / word_count + (word_count - 1.0) / word_count * (2.0 + math.log2(word_count - 1) / LEAF_BITS_PER_GUESS)
+
+    def _pattern_codes(self, guess_indices: np.ndarray, answer_indices: np.ndarray) -> np.ndarray:
+        if self.feedback_matrix is not None:
+            return self.feedback_matrix[np.ix_(guess_indices, answer_indices)]
+        return WordleFeedback.calc_pattern_codes(self.word_table.letter_codes[guess_indices], self.word_table.letter_codes[answer_indices])
+
+    def _check_budget(self):
+        if timer() > self.deadline:
+            raise LookaheadBudgetExceeded()
+
+    def _guess_value(self, codes: np.ndarray, answer_indices: np.ndarray, depth: int) -> float:
+        # Expected guesses for a guess with these feedback codes against the answers - 1 for the guess itself, plus
+        # the value of each group it leaves (a winning guess leaves nothing to solve)
+        winning_code = 3 ** self.word_table.letter_codes.shape[1] - 1
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        group_starts = np.flatnonzero(np.concatenate(([True], sorted_codes[1:] != sorted_codes[:-1])))
+        group_ends = np.append(group_starts[1:], len(sorted_codes))
+
+        value = 1.0
+        for start, end in zip(group_starts.tolist(), group_ends.tolist()):
+            if sorted_codes[start] == winning_code: continue
+            # np.sort keeps the group's key the same however the words were reached
+            group_value = self._set_value(np.sort(answer_indices[order[start:end]]), depth) if depth > 0 else WordleLookahead.estimate_guesses(end - start)
+            value += (end - start) / float(len(codes)) * group_value
+        return value
+
+    def _set_value(self, answer_indices: np.ndarray, depth: int) -> float:
+        # Expected guesses to solve a game from this (sorted) set of possible answers, searching depth guesses ahead.
+        # Guesses are drawn from the set itself, so they're valid in hard mode too
+        word_count = len(answer_indices)
+        if word_count <= 2:
+            return (1.0, 1.5)[word_count - 1]
+
+        memo_key = (depth, self.top_n, answer_indices.tobytes())
+        # A single lookup, as another thread can clear the memo between a membership test and the read
+        memo_value = LOOKAHEAD_MEMO.get(memo_key)
+        if memo_value is not None:
+            return memo_value
+        self._check_budget()
+
+        # The top N words by expected # of remaining words (ties go to the dictionary order)
+        expected_remaining = WordleFeedback.sum_group_scores(self.feedback_matrix, answer_indices, answer_indices, self.word_table.letter_codes.shape[1], lambda counts: counts * counts, self.word_table.letter_codes)
+        candidates = answer_indices[np.argsort(expected_remaining, kind='stable')[:self.top_n]]
+
+        best_value = np.inf
+        for codes in self._pattern_codes(candidates, answer_indices):
+            best_value = min(best_value, self._guess_value(codes, answer_indices, depth - 1))
+            self.evaluated_count += 1
+
+        if len(LOOKAHEAD_MEMO) >= LOOKAHEAD_MEMO_MAX_ENTRIES:
+            LOOKAHEAD_MEMO.clear()
+        LOOKAHEAD_MEMO[memo_key] = best_value
+        return best_value
+
+    def search(self, candidate_words: list, remaining_word_indices: np.ndarray) -> (str, int):
+        # Returns the best of the candidate guesses (given best first) and the depth it was searched to - the first
+        # candidate at depth 0, if the budget runs out before any guess is fully searched
+        self.deadline = timer() + self.budget_ms / 1000.0
+        self.evaluated_count = 0
+        best_guess, best_depth = candidate_words[0], 0
+        if len(remaining_word_indices) <= 2 or len(candidate_words) <= 1:
+            return best_guess, best_depth
+
+        candidate_indices = np.array([self.word_table.word_index[word] for word in candidate_words])
+        try:
+            all_codes = self._pattern_codes(candidate_indices, remaining_word_indices)
+            for depth in range(self.depth):
+                # Guesses are searched in order of their value at the previous level, so the budget goes to the most
+                # promising ones first - and a deeper level's best so far replaces the shallower level's choice
+                values = []
+                for codes in all_codes:
+                    self._check_budget()
+                    values.append(self._guess_value(codes, remaining_word_indices, depth))
+                    self.evaluated_count += 1
+                    if depth > 0 or len(values) == len(candidate_words):
+                        best_guess, best_depth = candidate_words[int(np.argmin(values))], depth + 1
+
+                order = np.argsort(values, kind='stable')
+                candidate_words = [candidate_words[i] for i in order]
+                all_codes = all_codes[order]
+        except LookaheadBudgetExceeded:
+            pass
+
+        return best_guess, best_depth
@@ -0,0 +1,83 @@
+import os
+import json
+import hashlib
+import numpy as np
+
+from wordle_solver import WordleSolver, OPENING_BOOK_DEPTH, optimal_score_settings
+from wordle_feedback import WordleFeedback
+
+# Bump this whenever the scoring logic changes in a way that would change the guesses stored in existing books
+OPENING_BOOK_VERSION = 1
+
+OPENING_BOOK_CACHE_DIR = 'resources/cache'
+
+
+class WordleOpeningBook:
+    # An opening book maps the feedback history of a game so far - a tuple of (guessed word, feedback pattern code)
+    # pairs - to the solver's guess for the next turn.  It covers the first OPENING_BOOK_DEPTH turns for one
+    # combination of hard / easy mode, guess strategy, scoring parameters and word list
+    @staticmethod
+    def _book_path(hard_mode: bool, score_settings: tuple, strategy: str, cache_dir: str = OPENING_BOOK_CACHE_DIR) -> str:
+        key = json.dumps([OPENING_BOOK_VERSION, OPENING_BOOK_DEPTH, hard_mode, strategy, list(score_settings), WordleFeedback.word_list_hash(WordleSolver.word_list())])
+        book_hash = hashlib.sha1(key.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(os.getcwd(), cache_dir, 'opening_book_{}_{}_{}.json'.format('hard' if hard_mode else 'easy', strategy, book_hash))
+
+    @staticmethod
+    def build_book(hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic') -> dict:
+        # Plays out every reachable feedback pattern for the opening turns and records the solver's guess for each
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        book = {}
+        WordleOpeningBook._expand_book(book, hard_mode, score_settings, strategy, [])
+        return book
+
+    @staticmethod
+    def _expand_book(book: dict, hard_mode: bool, score_settings: tuple, strategy: str, feedback_history: list):
+        # Replay the feedback history (the guesses come straight from the book) to reach this game state, then make
+        # the next guess - which records it into the book
+        wordle_solver = WordleSolver(hard_mode, *score_settings, suppress_output=True, opening_book=book, strategy=strategy)
+        for guessed_word, code in feedback_history:
+            wordle_solver._make_guess()
+            wordle_solver._process_feedback(guessed_word, *WordleFeedback.decode_feedback(code, len(guessed_word)))
+
+        best_guess = wordle_solver._make_guess()
+        if not best_guess or len(feedback_history) + 1 >= OPENING_BOOK_DEPTH: return
+
+        # Expand every feedback pattern that can come back from one of the remaining words (other than a win)
+        winning_code = 3 ** len(best_guess) - 1
+        guess_index = WordleSolver.word_index(best_guess)
+        for code in np.unique(WordleSolver.pattern_codes(guess_index, wordle_solver.remaining_word_indices)).tolist():
+            if code == winning_code: continue
+            WordleOpeningBook._expand_book(book, hard_mode, score_settings, strategy, feedback_history + [(best_guess, code)])
+
+    @staticmethod
+    def save_book(book: dict, hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic'):
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        book_path = WordleOpeningBook._book_path(hard_mode, score_settings, strategy)
+        os.makedirs(os.path.dirname(book_path), exist_ok=True)
+
+        # JSON can't key on tuples, so each feedback history is flattened into a "guess:code guess:code ..." string
+        entries = {' '.join('{}:{}'.format(guessed_word, code) for guessed_word, code in key): guess for key, guess in book.items()}
+        # Written to a temp file first, so a concurrent load never sees a partly written book
+        temp_path = '{}.{}.tmp'.format(book_path, os.getpid())
+        with open(temp_path, 'w') as f:
+            json.dump({'version': OPENING_BOOK_VERSION, 'hard_mode': hard_mode, 'strategy': strategy, 'score_settings': list(score_settings), 'entries': entries}, f, indent=1, sort_keys=True)
+        os.replace(temp_path, book_path)
+        return book_path
+
+    @staticmethod
+    def load_book(hard_mode: bool, score_settings: tuple = None, strategy: str = 'heuristic'):
+        # Returns the saved opening book for this mode, strategy and parameter set, or None if one hasn't been built
+        score_settings = tuple(score_settings) if score_settings else tuple(optimal_score_settings[hard_mode])
+        book_path = WordleOpeningBook._book_path(hard_mode, score_settings, strategy)
+        if not os.path.exists(book_path):
+            return None
+
+        with open(book_path, 'r') as f:
+            saved_book = json.load(f)
+        if saved_book.get('version') != OPENING_BOOK_VERSION:
+            return None
+
+        book = {}
+        for key, guess in saved_book['entries'].items():
+            book[tuple((guessed_word, int(code)) for guessed_word, code in (item.split(':') for item in key.split()))] = guess
+        return book
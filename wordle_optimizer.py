@@ -1,32 +1,47 @@
-import os
+import math
 import random
+import multiprocessing
 from timeit import default_timer as timer
 from collections import defaultdict
 
-from wordle_solver import WordleSolver
+from wordle_solver import WordleSolver, MAX_GUESSES, optimal_score_settings, dictionary_settings
+from wordle_feedback import WordleFeedback
+from wordle_compiled_words import WordleCompiledWords
+from wordle_tracer import WordleTracer
+from wordle_lookahead import lookahead_settings
+from wordle_result_store import WordleResultStore
+
+# Successive halving: keep the best 1/ETA of the candidates after each rung, and grow the word subset by ETA
+HALVING_ETA = 3
+HALVING_MIN_WORDS = 50
 
 
 class WordleOptimizer:
     @staticmethod
-    def _get_historical_words(word_len: int = 5, path: str = 'resources/historical_answers.txt') -> list:
-        valid_words = []
-
-        # Load the historical words list
-        historical_answers_path = os.path.join(os.getcwd(), path)
-        with open(historical_answers_path, 'r') as f:
-            for i, line in enumerate(f):
-                word = str(line).strip()
-                if len(word) != word_len: continue
-                valid_words.append(word)
+    def _get_historical_words(word_len: int = None, path: str = 'resources/historical_answers.txt') -> list:
+        # Load the historical words list (from the compiled word file, which is rebuilt whenever the list changes) -
+        # just the words with the dictionary's word length, by default
+        word_len = word_len or dictionary_settings['word_len']
+        _, _, _, historical_answers = WordleCompiledWords.load(dictionary_settings['words_path'], path, word_len=dictionary_settings['word_len'], min_frequency=dictionary_settings['min_frequency'])
+        valid_words = [word for word in historical_answers if len(word) == word_len]
 
-                # *** TESTING ONLY ****
-                # if len(valid_words) > 10: break
-                # if len(valid_words) > 150: break
+        # *** TESTING ONLY ****
+        # valid_words = valid_words[:10]
+        # valid_words = valid_words[:150]
 
         return valid_words
 
     @staticmethod
     def _calc_feedback(word: str, guess_word: str) -> (list, list):
+        # Look the feedback up in the precomputed pattern matrix, falling back to computing it directly for words
+        # that aren't part of the dictionary
+        code = WordleSolver.lookup_feedback(guess_word, word)
+        if code is None:
+            return WordleOptimizer._calc_feedback_direct(word, guess_word)
+        return WordleFeedback.decode_feedback(code, len(guess_word))
+
+    @staticmethod
+    def _calc_feedback_direct(word: str, guess_word: str) -> (list, list):
         # Determine which letters are correctly placed (green) or incorrectly placed (yellow)
         # given the target word and guessed word
         wrongly_placed_letter_positions = []
@@ -51,91 +66,289 @@ class WordleOptimizer:
         return wrongly_placed_letter_positions, correctly_placed_letter_positions
 
     @staticmethod
-    def _run_simulation(historical_words, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor):
-        # Plays a single game of Wordle for each historical word and determines the average # of guesses across
-        # all historical words
+    def _play_game(word, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, strategy: str = 'heuristic', opening_book: dict = None, tracer: WordleTracer = None) -> int:
+        # Plays a single game of Wordle against the word and returns the # of guesses taken, or 0 if it could not
+        # be solved
+        wordle_solver = WordleSolver(
+            hard_mode=hard_mode,
+            letter_freq_score_factor=letter_freq_score_factor,
+            letter_pos_freq_score_factor=letter_pos_freq_score_factor,
+            eng_word_freq_score_factor=eng_word_freq_score_factor,
+            incorrect_pos_letter_score_factor=incorrect_pos_letter_score_factor,
+            best_word_score_cutoff_factor=best_word_score_cutoff_factor,
+            suppress_output=True,
+            opening_book=opening_book,
+            strategy=strategy,
+            tracer=tracer
+        )
+        if tracer:
+            tracer.annotate_game(answer=word)
+        # wordle_solver.play_game()
+        # print("\n*** Word is: {}".format(word.upper()))
+
+        for guess_num in range(1, wordle_solver.max_tries + 1):
+            best_guess = wordle_solver._make_guess()
+            if not best_guess:
+                # print("*** No more guesses remaining for word: {} ***".format(word.upper()))
+                return 0
+            # print("Guess word: {}".format(best_guess.upper()))
+
+            wrongly_placed_letter_positions, correctly_placed_letter_positions = WordleOptimizer._calc_feedback(word, best_guess)
+            wordle_solver._process_feedback(best_guess, wrongly_placed_letter_positions, correctly_placed_letter_positions)
+
+            if wordle_solver.is_game_won():
+                # print("{} - {} guesses".format(word.upper(), guess_num))
+                return guess_num
+
+            if wordle_solver.is_game_lost():
+                # print("*** Too many tries for word: {} ***".format(word.upper()))
+                return 0
+
+        return 0
+
+    @staticmethod
+    def _play_games(historical_words, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, strategy: str = 'heuristic', tracer: WordleTracer = None) -> (list, list):
+        # Plays a single game of Wordle for each historical word and returns the # of guesses taken for each one,
+        # along with the list of words that could not be solved
         # historical_words = TestWordleSolver.get_historical_words()
         guess_counts = []
         failed_words = []
 
+        # The opening guesses only depend on the feedback so far, so they're shared between all games for this sample
+        opening_book = {}
+
         for word in historical_words:
-            wordle_solver = WordleSolver(
-                hard_mode=hard_mode,
-                letter_freq_score_factor=letter_freq_score_factor,
-                letter_pos_freq_score_factor=letter_pos_freq_score_factor,
-                eng_word_freq_score_factor=eng_word_freq_score_factor,
-                incorrect_pos_letter_score_factor=incorrect_pos_letter_score_factor,
-                best_word_score_cutoff_factor=best_word_score_cutoff_factor,
-                suppress_output=True
-            )
-            # wordle_solver.play_game()
-            # print("\n*** Word is: {}".format(word.upper()))
-
-            for guess_num in range(1, wordle_solver.max_tries + 1):
-                best_guess = wordle_solver._make_guess()
-                if not best_guess:
-                    # print("*** No more guesses remaining for word: {} ***".format(word.upper()))
-                    guess_counts.append(wordle_solver.max_tries + 5)
-                    failed_words.append(word)
-                    break
-                # print("Guess word: {}".format(best_guess.upper()))
-
-                wrongly_placed_letter_positions, correctly_placed_letter_positions = WordleOptimizer._calc_feedback(word, best_guess)
-                wordle_solver._process_feedback(best_guess, wrongly_placed_letter_positions, correctly_placed_letter_positions)
-
-                if wordle_solver.is_game_won():
-                    # print("{} - {} guesses".format(word.upper(), guess_num))
-                    guess_counts.append(guess_num)
-                    break
-
-                if wordle_solver.is_game_lost():
-                    # print("*** Too many tries for word: {} ***".format(word.upper()))
-                    guess_counts.append(wordle_solver.max_tries + 5)
-                    failed_words.append(word)
-                    break
+            guess_count = WordleOptimizer._play_game(word, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, strategy, opening_book, tracer)
+            if guess_count:
+                guess_counts.append(guess_count)
+            else:
+                guess_counts.append(MAX_GUESSES + 5)
+                failed_words.append(word)
 
             # if len(guess_counts) % 100 == 0:
             #     print("\nWords guessed: {}, Avg guess count: {:.4f}\n".format(len(guess_counts), sum(guess_counts) / float(len(guess_counts))))
 
+        return guess_counts, failed_words
+
+    @staticmethod
+    def _run_simulation(historical_words, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, strategy: str = 'heuristic', tracer: WordleTracer = None):
+        # Plays a single game of Wordle for each historical word and determines the average # of guesses across
+        # all historical words (recording every game into the tracer, if given)
+        guess_counts, failed_words = WordleOptimizer._play_games(historical_words, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, strategy, tracer)
         avg_guess_count = sum(guess_counts) / float(len(guess_counts))
         # print("\nMissing words: {}\n".format(failed_words))
         # print("\nWords guessed: {}, Avg guess count: {:.4f}\n".format(len(guess_counts), avg_guess_count))
         return avg_guess_count, len(failed_words)
 
     @staticmethod
-    def optimize_scoring_model(hard_mode: bool, iterations: int):
-        print("\n*** Running optimization - {} mode for {} iterations... ***".format('HARD' if hard_mode else 'EASY', iterations))
+    def _init_worker(settings: dict = None, search_settings: dict = None):
+        # Load the word tables once per worker process - every game played by the worker then shares them (the
+        # parent's dictionary and lookahead settings are passed in, as a spawned worker doesn't inherit them)
+        if settings is not None and settings != dictionary_settings:
+            WordleSolver.configure_dictionary(**settings)
+        if search_settings is not None:
+            lookahead_settings.update(search_settings)
+        WordleSolver.load_words()
+        WordleSolver.load_feedback_matrix()
+
+    @staticmethod
+    def _play_games_timed(args) -> (int, int, int, float, WordleTracer):
+        # Worker entry point - plays one chunk of historical words for one parameter sample (the chunk's trace is
+        # sent back to be merged, when tracing)
+        historical_words, hard_mode, sample, strategy, trace = args
+        tracer = WordleTracer() if trace else None
+        start = timer()
+        guess_counts, failed_words = WordleOptimizer._play_games(historical_words, hard_mode, *sample, strategy=strategy, tracer=tracer)
+        end = timer()
+        return sum(guess_counts), len(guess_counts), len(failed_words), (end - start), tracer
+
+    @staticmethod
+    def _run_simulations(historical_words, hard_mode, samples, workers: int = 1, strategy: str = 'heuristic', tracer: WordleTracer = None, store: WordleResultStore = None):
+        # Yields (avg_guess_count, failed_word_count, elapsed_time) for each parameter sample, in sample order
+        if store is not None:
+            yield from WordleOptimizer._run_stored_simulations(historical_words, hard_mode, samples, workers, strategy, tracer, store)
+            return
+
+        if workers <= 1:
+            for sample in samples:
+                start = timer()
+                avg_guess_count, failed_word_count = WordleOptimizer._run_simulation(historical_words, hard_mode, *sample, strategy=strategy, tracer=tracer)
+                end = timer()
+                yield avg_guess_count, failed_word_count, (end - start)
+            return
+
+        # Split each sample's games across the workers.  Tasks for all samples are queued at once so workers that
+        # finish early move on to the next sample, while imap hands results back strictly in submission order
+        # (elapsed_time is then the total time spent by the workers on that sample)
+        chunk_size = math.ceil(len(historical_words) / workers)
+        chunks = [historical_words[i:i + chunk_size] for i in range(0, len(historical_words), chunk_size)]
+        tasks = ((chunk, hard_mode, sample, strategy, tracer is not None) for sample in samples for chunk in chunks)
+
+        with multiprocessing.Pool(workers, initializer=WordleOptimizer._init_worker, initargs=(dict(dictionary_settings), dict(lookahead_settings))) as pool:
+            results = pool.imap(WordleOptimizer._play_games_timed, tasks)
+            for _ in samples:
+                total_guesses, total_games, failed_word_count, elapsed_time = 0, 0, 0, 0.0
+                for _ in chunks:
+                    chunk_guesses, chunk_games, chunk_failed, chunk_time, chunk_tracer = next(results)
+                    if chunk_tracer:
+                        tracer.merge(chunk_tracer)
+                    total_guesses += chunk_guesses
+                    total_games += chunk_games
+                    failed_word_count += chunk_failed
+                    elapsed_time += chunk_time
+                yield total_guesses / float(total_games), failed_word_count, elapsed_time
+
+    @staticmethod
+    def _run_stored_simulations(historical_words, hard_mode, samples, workers: int, strategy: str, tracer: WordleTracer, store: WordleResultStore):
+        # As _run_simulations, but samples already in the store are served from it (with an elapsed_time of 0) and
+        # only the rest are simulated - each one is saved to the store as soon as its result comes in
+        answers_hash = WordleFeedback.word_list_hash(sorted(historical_words))
+        stored_results = {sample: store.get(sample, hard_mode, strategy, answers_hash) for sample in samples}
+        new_samples = [sample for sample in samples if stored_results[sample] is None]
+        new_results = WordleOptimizer._run_simulations(historical_words, hard_mode, new_samples, workers, strategy, tracer)
+
+        for sample in samples:
+            if stored_results[sample] is not None:
+                avg_guess_count, failed_word_count, _ = stored_results[sample]
+                yield avg_guess_count, failed_word_count, 0.0
+                continue
+
+            avg_guess_count, failed_word_count, elapsed_time = next(new_results)
+            store.put(sample, hard_mode, strategy, answers_hash, len(historical_words), avg_guess_count, failed_word_count, elapsed_time)
+            yield avg_guess_count, failed_word_count, elapsed_time
+
+    @staticmethod
+    def _draw_sample(hard_mode: bool) -> tuple:
+        letter_freq_score_factor = random.uniform(0.5, 3)
+        letter_pos_freq_score_factor = random.uniform(0, 2)
+        eng_word_freq_score_factor = random.uniform(0.5, 3)
+        incorrect_pos_letter_score_factor = random.uniform(0, 1.0)
+        best_word_score_cutoff_factor = 0 if hard_mode else random.uniform(0, 1)
+        return letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor
+
+    @staticmethod
+    def optimize_scoring_model(hard_mode: bool, iterations: int, workers: int = 1, seed: int = None, strategy: str = 'heuristic', tracer: WordleTracer = None,
+                               store: WordleResultStore = None):
+        # With a strategy other than 'heuristic' the scoring factors aren't used, so the rows show the strategy's
+        # avg_guess_count for comparison with the heuristic
+        print("\n*** Running optimization - {} mode, {} strategy for {} iterations... ***".format('HARD' if hard_mode else 'EASY', strategy, iterations))
 
         # Optimizes the scoring system by trying different weighting values for each of the scoring components
         # Outputs to the console in a CSV format (tab-delimited)
         historical_words = WordleOptimizer._get_historical_words()
+
+        # Build (or load) the shared word tables before any workers start, so they don't all try to build them
+        WordleOptimizer._init_worker()
+
+        # All samples are drawn up-front, so the rows are identical for a given seed regardless of the worker count
+        if seed is not None:
+            random.seed(seed)
+        samples = [WordleOptimizer._draw_sample(hard_mode) for _ in range(iterations)]
+        samples = [sample for sample in samples if sample[0] + sample[1] + sample[2] > 0]
+
+        # With a result store, samples are rounded to the precision they're stored at, so repeats are served from it
+        if store is not None:
+            samples = [WordleResultStore.round_sample(sample) for sample in samples]
+
         print("\nletter_freq_score_factor\tletter_pos_freq_score_factor\teng_word_freq_score_factor\tincorrect_pos_letter_score_factor\tbest_word_score_cutoff_factor\thard_mode\tavg_guess_count\tfailed_word_count\telapsed_time")
 
         try:
-            for i in range(iterations):
-            # for letter_freq_score_factor in [1.5, 2.5]:
-            #     for letter_pos_freq_score_factor in [1.0, 1.5]:
-            #         for eng_word_freq_score_factor in [1.0, 1.5, 2.0]:
-            #             for best_word_score_cutoff_factor in [0.1, 0.3]:
-            #                 for incorrect_pos_letter_score_factor in [0, 0.5, 1.0]:
-                                # best_word_score_cutoff_factor = 0
-
-                letter_freq_score_factor = random.uniform(0.5, 3)
-                letter_pos_freq_score_factor = random.uniform(0, 2)
-                eng_word_freq_score_factor = random.uniform(0.5, 3)
-                incorrect_pos_letter_score_factor = random.uniform(0, 1.0)
-                best_word_score_cutoff_factor = 0 if hard_mode else random.uniform(0, 1)
-
-                if letter_freq_score_factor + letter_pos_freq_score_factor + eng_word_freq_score_factor <= 0: continue
+            for sample, (avg_guess_count, failed_word_count, elapsed_time) in zip(samples, WordleOptimizer._run_simulations(historical_words, hard_mode, samples, workers, strategy, tracer, store)):
+                letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor = sample
+                print("{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{}\t{:.4f}\t{}\t{:.1f}".format(letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, str(hard_mode).upper(), avg_guess_count, failed_word_count, elapsed_time))
 
-                start = timer()
-                # print("\nRunning simulation: letter_freq_score_factor = {:.1f}, letter_pos_freq_score_factor = {:.1f}, eng_word_freq_score_factor = {:.1f} ...".format(letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor))
-                avg_guess_count, failed_word_count = WordleOptimizer._run_simulation(historical_words, hard_mode, letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor)
-                end = timer()
+        except (InterruptedError, KeyboardInterrupt):
+            pass
+
+    @staticmethod
+    def optimize_scoring_model_halving(hard_mode: bool, iterations: int, workers: int = 1, seed: int = None, strategy: str = 'heuristic', eta: int = HALVING_ETA, tracer: WordleTracer = None,
+                                       store: WordleResultStore = None):
+        print("\n*** Running successive halving optimization - {} mode, {} strategy for {} candidates... ***".format('HARD' if hard_mode else 'EASY', strategy, iterations))
+
+        # Scores candidate parameter vectors on a growing (shuffled) subset of the historical words, keeping only the
+        # best 1/eta of them after each rung - weak candidates get dropped after only a few hundred games, and only
+        # the last few survivors are scored against every historical word.  The current optimal settings are kept
+        # through every rung, so the final comparison is always against them on the full word list and the result
+        # can't be worse than them
+        historical_words = WordleOptimizer._get_historical_words()
+        WordleOptimizer._init_worker()
+
+        if seed is not None:
+            random.seed(seed)
+        candidates = [tuple(optimal_score_settings[hard_mode])] + [WordleOptimizer._draw_sample(hard_mode) for _ in range(iterations)]
+        candidates = [sample for sample in candidates if sample[0] + sample[1] + sample[2] > 0]
+        if store is not None:
+            candidates = list(dict.fromkeys(WordleResultStore.round_sample(sample) for sample in candidates))
+        current_sample = candidates[0]
+        random.shuffle(historical_words)
+
+        rungs = math.ceil(math.log(len(candidates), eta)) + 1 if len(candidates) > 1 else 1
+        subset_sizes = [min(len(historical_words), max(HALVING_MIN_WORDS, int(len(historical_words) / eta ** (rungs - 1 - k)))) for k in range(rungs)]
+
+        # Running totals per candidate, so each rung only needs to play the words added since the previous rung
+        totals = {sample: [0, 0, 0, 0.0] for sample in candidates}
+        simulated_games = 0
+        evaluated_words = 0
+
+        print("\nletter_freq_score_factor\tletter_pos_freq_score_factor\teng_word_freq_score_factor\tincorrect_pos_letter_score_factor\tbest_word_score_cutoff_factor\thard_mode\tavg_guess_count\tfailed_word_count\telapsed_time\tword_count")
+
+        try:
+            for subset_size in subset_sizes:
+                new_words = historical_words[evaluated_words:subset_size]
+                evaluated_words = subset_size
+
+                if new_words:
+                    for sample, (avg_guess_count, failed_word_count, elapsed_time) in zip(candidates, WordleOptimizer._run_simulations(new_words, hard_mode, candidates, workers, strategy, tracer, store)):
+                        total = totals[sample]
+                        total[0] += round(avg_guess_count * len(new_words))
+                        total[1] += len(new_words)
+                        total[2] += failed_word_count
+                        total[3] += elapsed_time
+                        simulated_games += len(new_words)
 
-                print("{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{}\t{:.4f}\t{}\t{:.1f}".format(letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, str(hard_mode).upper(), avg_guess_count, failed_word_count, (end - start)))
+                for sample in candidates:
+                    total_guesses, word_count, failed_word_count, elapsed_time = totals[sample]
+                    letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor = sample
+                    print("{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{:.3f}\t{}\t{:.4f}\t{}\t{:.1f}\t{}".format(letter_freq_score_factor, letter_pos_freq_score_factor, eng_word_freq_score_factor, incorrect_pos_letter_score_factor, best_word_score_cutoff_factor, str(hard_mode).upper(), total_guesses / float(word_count), failed_word_count, elapsed_time, word_count))
 
-                # raise InterruptedError
+                # Candidates scored on every historical word by now are stored as full sweeps as well
+                if store is not None and evaluated_words >= len(historical_words):
+                    for sample in candidates:
+                        total_guesses, word_count, failed_word_count, elapsed_time = totals[sample]
+                        store.put(sample, hard_mode, strategy, WordleFeedback.word_list_hash(sorted(historical_words)), word_count, total_guesses / float(word_count), failed_word_count, elapsed_time)
+
+                # Keep the best 1/eta of the candidates (sorted is stable, so ties keep their original order), plus the
+                # current settings
+                candidates = sorted(candidates, key=lambda sample: totals[sample][0] / float(totals[sample][1]))[:max(1, math.ceil(len(candidates) / eta))]
+                if current_sample not in candidates:
+                    candidates.append(current_sample)
 
         except (InterruptedError, KeyboardInterrupt):
-            pass
+            print("\n*** Interrupted ***")
+
+        # The best of the candidates scored on the most words (the first once the last rung is done) - an
+        # interrupted rung can leave only some of them scored on its words
+        scored_candidates = [sample for sample in candidates if totals[sample][1] > 0]
+        if not scored_candidates: return
+        most_words = max(totals[sample][1] for sample in scored_candidates)
+        best_sample = min((sample for sample in scored_candidates if totals[sample][1] == most_words), key=lambda sample: totals[sample][0] / float(totals[sample][1]))
+        total_guesses, word_count = totals[best_sample][0], totals[best_sample][1]
+
+        print("\n*** Best settings: ({}) - avg guess count {:.4f} over {} words ({} games simulated vs {} for a full sweep) ***".format(
+            ', '.join('{:.3f}'.format(v) for v in best_sample), total_guesses / float(word_count), word_count, simulated_games, len(totals) * len(historical_words)))
+
+    @staticmethod
+    def save_best_settings(hard_mode: bool, profile_name: str, strategy: str = 'heuristic', store: WordleResultStore = None) -> int:
+        # Picks the best settings scored on every historical word so far and saves them as a score profile (which
+        # main.py --profile then plays with in place of optimal_score_settings)
+        store = store if store is not None else WordleResultStore()
+        best = store.best(hard_mode, strategy, WordleFeedback.word_list_hash(sorted(WordleOptimizer._get_historical_words())))
+        if best is None:
+            print("\n**** ERROR: no {} mode, {} strategy results for the full historical word list in {} ****\n".format('HARD' if hard_mode else 'EASY', strategy, store.path))
+            return 1
+
+        settings, avg_guess_count, failed_word_count = best
+        profiles_path = WordleResultStore.save_profile(profile_name, hard_mode, settings)
+        print("\n*** Best settings: ({}) - avg guess count {:.4f}, {} failed words (from {} stored results) ***".format(', '.join('{:.3f}'.format(v) for v in settings), avg_guess_count, failed_word_count, store.count()))
+        print("Saved as the {} mode settings of profile '{}' in {}".format('HARD' if hard_mode else 'EASY', profile_name, profiles_path))
+        return 0
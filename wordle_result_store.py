@@ -0,0 +1,105 @@
+import os
+import json
+import time
+import sqlite3
+
+from wordle_solver import WordleSolver
+from wordle_feedback import WordleFeedback
+
+DEFAULT_RESULT_STORE_PATH = 'resources/cache/optimizer_results.sqlite3'
+
+# Parameter vectors are rounded to this many decimals (the precision the optimizer prints them at) before they're
+# simulated, so near-identical vectors share one stored result
+RESULT_STORE_PRECISION = 3
+
+SCORE_PROFILES_PATH = 'resources/score_profiles.json'
+
+
+class WordleResultStore:
+    # Every parameter sample the optimizer simulates, kept in a local SQLite database.  A result is keyed by the
+    # parameter vector, hard mode, guess strategy and hashes of the dictionary and of the answers it was scored on
+    # (so results for a subset of the historical answers are kept apart from full sweeps) - and a sample that's already
+    # in the store is never simulated again
+    def __init__(self, path: str = DEFAULT_RESULT_STORE_PATH):
+        self.path = os.path.join(os.getcwd(), path)
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("""
+            CREATE TABLE IF NOT EXISTS samples (
+                settings TEXT NOT NULL,
+                hard_mode INTEGER NOT NULL,
+                strategy TEXT NOT NULL,
+                dictionary_hash TEXT NOT NULL,
+                answers_hash TEXT NOT NULL,
+                word_count INTEGER NOT NULL,
+                avg_guess_count REAL NOT NULL,
+                failed_word_count INTEGER NOT NULL,
+                elapsed_time REAL NOT NULL,
+                created REAL NOT NULL,
+                PRIMARY KEY (settings, hard_mode, strategy, dictionary_hash, answers_hash)
+            )""")
+        self.connection.commit()
+        self.dictionary_hash = WordleFeedback.word_list_hash(WordleSolver.word_list())
+
+    def close(self):
+        self.connection.close()
+
+    @staticmethod
+    def round_sample(sample: tuple) -> tuple:
+        return tuple(round(float(value), RESULT_STORE_PRECISION) for value in sample)
+
+    @staticmethod
+    def _settings_key(sample: tuple) -> str:
+        return json.dumps(list(WordleResultStore.round_sample(sample)))
+
+    def get(self, sample: tuple, hard_mode: bool, strategy: str, answers_hash: str):
+        # Returns the stored (avg_guess_count, failed_word_count, elapsed_time) for the sample, or None
+        row = self.connection.execute(
+            "SELECT avg_guess_count, failed_word_count, elapsed_time FROM samples WHERE settings = ? AND hard_mode = ? AND strategy = ? AND dictionary_hash = ? AND answers_hash = ?",
+            (WordleResultStore._settings_key(sample), int(hard_mode), strategy, self.dictionary_hash, answers_hash)).fetchone()
+        return tuple(row) if row else None
+
+    def put(self, sample: tuple, hard_mode: bool, strategy: str, answers_hash: str, word_count: int, avg_guess_count: float, failed_word_count: int, elapsed_time: float):
+        # Committed straight away, so an interrupted optimizer run keeps every sample it finished
+        self.connection.execute(
+            "INSERT OR REPLACE INTO samples VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (WordleResultStore._settings_key(sample), int(hard_mode), strategy, self.dictionary_hash, answers_hash, word_count, avg_guess_count, failed_word_count, elapsed_time, time.time()))
+        self.connection.commit()
+
+    def best(self, hard_mode: bool, strategy: str, answers_hash: str):
+        # Returns (settings, avg_guess_count, failed_word_count) for the best sample scored on these answers, or None
+        row = self.connection.execute(
+            "SELECT settings, avg_guess_count, failed_word_count FROM samples WHERE hard_mode = ? AND strategy = ? AND dictionary_hash = ? AND answers_hash = ? "
+            "ORDER BY avg_guess_count, failed_word_count, created LIMIT 1",
+            (int(hard_mode), strategy, self.dictionary_hash, answers_hash)).fetchone()
+        return (tuple(json.loads(row[0])), row[1], row[2]) if row else None
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+
+    @staticmethod
+    def save_profile(name: str, hard_mode: bool, settings: tuple, path: str = SCORE_PROFILES_PATH) -> str:
+        # Adds (or updates) the settings for one mode of a named optimal_score_settings profile
+        profiles_path = os.path.join(os.getcwd(), path)
+        profiles = {}
+        if os.path.exists(profiles_path):
+            with open(profiles_path, 'r') as f:
+                profiles = json.load(f)
+
+        profiles.setdefault(name, {})['hard' if hard_mode else 'easy'] = list(settings)
+        with open(profiles_path, 'w') as f:
+            json.dump(profiles, f, indent=1, sort_keys=True)
+        return profiles_path
+
+    @staticmethod
+    def load_profile(name: str, path: str = SCORE_PROFILES_PATH) -> dict:
+        # Returns the named profile as {hard_mode: settings} for the mode(s) it has settings for
+        profiles_path = os.path.join(os.getcwd(), path)
+        profiles = {}
+        if os.path.exists(profiles_path):
+            with open(profiles_path, 'r') as f:
+                profiles = json.load(f)
+        if name not in profiles:
+            raise ValueError("no score profile named '{}' in {}".format(name, path))
+
+        return {mode == 'hard': tuple(settings) for mode, settings in profiles[name].items()}
@@ -0,0 +1,208 @@
+import sys
+import time
+import uuid
+import asyncio
+import threading
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+from wordle_solver import WordleSolver
+from wordle_feedback import WordleFeedback
+from wordle_batch import WordleBatchSolver
+
+# Sessions that haven't been used for this many seconds are evicted
+DEFAULT_SESSION_TTL = 30 * 60
+
+# Approximate memory cap for all session state - the least recently used sessions are evicted beyond it
+DEFAULT_SESSION_MEMORY_CAP_MB = 64
+
+# Number of recent request latencies kept per command for the percentile stats
+LATENCY_WINDOW = 10000
+
+SERVER_COMMANDS = ('NEW', 'GUESS', 'FEEDBACK', 'END', 'STATS')
+
+
+class WordleSession:
+    # Per-session state is just the mode and the guess history - a compact tuple of (guess, feedback pattern code)
+    # pairs.  Everything else (word table, opening book, scoring) is shared, and each guess is computed by replaying
+    # the history on a pooled solver
+    __slots__ = ('session_id', 'hard_mode', 'feedback_history', 'last_used')
+
+    def __init__(self, session_id: str, hard_mode: bool):
+        self.session_id = session_id
+        self.hard_mode = hard_mode
+        self.feedback_history = ()
+        self.last_used = time.monotonic()
+
+    def size(self) -> int:
+        # Rough estimate of the memory held by this session, in bytes
+        return sys.getsizeof(self) + sys.getsizeof(self.session_id) + sys.getsizeof(self.feedback_history) + sum(sys.getsizeof(item) + sys.getsizeof(item[0]) for item in self.feedback_history)
+
+
+class WordleServer:
+    # Line-based protocol, one request per line (responses are "OK ..." or "ERR <message>"):
+    #   NEW [hard|easy]                   -> OK <session id>
+    #   GUESS <session id>                -> OK <best guess> <# remaining words>  (or OK SOLVED / OK NONE)
+    #   FEEDBACK <session id> <word> <pattern>
+    #                                     -> OK  (pattern is one letter per position: G=green, Y=yellow, B=grey)
+    #   END <session id>                  -> OK
+    #   STATS                             -> OK <session count> <command>:p50/p90/p99 ... (latencies in ms)
+    def __init__(self, hard_mode: bool = True, strategy: str = 'heuristic', workers: int = 1, session_ttl: float = DEFAULT_SESSION_TTL,
+                 memory_cap_mb: float = DEFAULT_SESSION_MEMORY_CAP_MB):
+        self.hard_mode = hard_mode
+        self.strategy = strategy
+        self.session_ttl = session_ttl
+        self.memory_cap = memory_cap_mb * 1024 * 1024
+
+        self.sessions = OrderedDict()
+        self.session_memory = 0
+        self.latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+
+        # Scoring runs in worker threads, each with its own (reused) solvers
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers))
+        self.thread_solvers = threading.local()
+
+    def _solve(self, hard_mode: bool, feedback_history: tuple) -> dict:
+        if not hasattr(self.thread_solvers, 'batch_solver'):
+            self.thread_solvers.batch_solver = WordleBatchSolver(hard_mode=self.hard_mode, strategy=self.strategy)
+
+        guesses = []
+        for guessed_word, code in feedback_history:
+            wrongly_placed_letter_positions, correctly_placed_letter_positions = WordleFeedback.decode_feedback(code, len(guessed_word))
+            guesses.append({'word': guessed_word, 'yellow': wrongly_placed_letter_positions, 'green': correctly_placed_letter_positions})
+        return self.thread_solvers.batch_solver.solve(guesses, hard_mode)
+
+    def _add_session(self, session: WordleSession):
+        self.sessions[session.session_id] = session
+        self.session_memory += session.size()
+        self._evict_sessions()
+
+    def _remove_session(self, session_id: str):
+        session = self.sessions.pop(session_id, None)
+        if session:
+            self.session_memory -= session.size()
+
+    def _get_session(self, session_id: str) -> WordleSession:
+        session = self.sessions.get(session_id)
+        if session is None or time.monotonic() - session.last_used > self.session_ttl:
+            self._remove_session(session_id)
+            raise KeyError("unknown or expired session '{}'".format(session_id))
+
+        session.last_used = time.monotonic()
+        self.sessions.move_to_end(session_id)
+        return session
+
+    def _evict_sessions(self):
+        # Sessions are kept in least-recently-used order, so idle and over-the-cap evictions both come off the front
+        now = time.monotonic()
+        while self.sessions:
+            session = next(iter(self.sessions.values()))
+            if now - session.last_used <= self.session_ttl and self.session_memory <= self.memory_cap: break
+            self._remove_session(session.session_id)
+
+    async def _handle_request(self, line: str) -> str:
+        parts = line.split()
+        if not parts:
+            raise ValueError("empty request")
+        command = parts[0].upper()
+
+        if command == 'NEW':
+            if len(parts) > 2 or (len(parts) == 2 and parts[1].lower() not in ('hard', 'easy')):
+                raise ValueError("NEW takes an optional mode of 'hard' or 'easy'")
+            hard_mode = self.hard_mode if len(parts) < 2 else parts[1].lower() == 'hard'
+            session = WordleSession(uuid.uuid4().hex, hard_mode)
+            self._add_session(session)
+            return 'OK {}'.format(session.session_id)
+
+        if command == 'GUESS' and len(parts) == 2:
+            session = self._get_session(parts[1])
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, self._solve, session.hard_mode, session.feedback_history)
+            if result['solved']:
+                return 'OK SOLVED'
+            return 'OK {} {}'.format(result['guess'], result['remaining']) if result['guess'] else 'OK NONE'
+
+        if command == 'FEEDBACK' and len(parts) == 4:
+            session = self._get_session(parts[1])
+            word, pattern = parts[2].lower(), parts[3].upper()
+            if len(pattern) != len(word) or set(pattern) - set('GYB'):
+                raise ValueError("pattern '{}' must have one of G, Y or B for each letter of '{}'".format(parts[3], word))
+
+            # Checked against the dictionary now, so a bad guess can't get stuck in the session's history
+            word, wrongly_placed_letter_positions, correctly_placed_letter_positions = WordleBatchSolver._parse_guess({
+                'word': word, 'yellow': [i + 1 for i, c in enumerate(pattern) if c == 'Y'], 'green': [i + 1 for i, c in enumerate(pattern) if c == 'G']
+            }, WordleSolver.load_words().letter_codes.shape[1])
+            self.session_memory -= session.size()
+            session.feedback_history += ((word, WordleFeedback.encode_feedback(wrongly_placed_letter_positions, correctly_placed_letter_positions)),)
+            self.session_memory += session.size()
+            self._evict_sessions()
+            return 'OK'
+
+        if command == 'END' and len(parts) == 2:
+            self._remove_session(parts[1])
+            return 'OK'
+
+        if command == 'STATS':
+            percentiles = []
+            for name, latencies in sorted(self.latencies.items()):
+                ordered = sorted(latencies)
+                percentiles.append('{}:{}'.format(name, '/'.join('{:.2f}'.format(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000) for p in (0.5, 0.9, 0.99))))
+            return ' '.join(['OK', str(len(self.sessions))] + percentiles)
+
+        raise ValueError("unknown request '{}'".format(line.strip()))
+
+    async def _handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+
+                start = time.perf_counter()
+                request = line.decode('utf-8', errors='replace').strip()
+                try:
+                    response = await self._handle_request(request)
+                except (ValueError, KeyError) as e:
+                    response = 'ERR {}'.format(e.args[0] if e.args else e)
+                except Exception as e:
+                    # Anything else that went wrong solving a request fails just that request, not the connection
+                    response = 'ERR internal error ({}: {})'.format(type(e).__name__, e)
+                command = request.split()[0].upper() if request else ''
+                self.latencies[command if command in SERVER_COMMANDS else 'OTHER'].append(time.perf_counter() - start)
+
+                writer.write((response + '\n').encode('utf-8'))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _evict_idle_sessions(self):
+        while True:
+            await asyncio.sleep(max(1.0, min(60.0, self.session_ttl / 4)))
+            self._evict_sessions()
+
+    async def serve(self, address: str):
+        # Address is either HOST:PORT for TCP or unix:PATH for a Unix domain socket
+        # The word tables and feedback matrix are loaded up-front, so worker threads don't all build them at once
+        WordleSolver.load_words()
+        WordleSolver.load_feedback_matrix()
+        if address.startswith('unix:'):
+            server = await asyncio.start_unix_server(self._handle_client, path=address[len('unix:'):])
+        else:
+            host, _, port = address.rpartition(':')
+            server = await asyncio.start_server(self._handle_client, host or '127.0.0.1', int(port))
+
+        print("*** Wordle Solver server listening on {} ***".format(address), flush=True)
+        eviction_task = asyncio.create_task(self._evict_idle_sessions())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            eviction_task.cancel()
+            self.executor.shutdown(wait=False)
+
+    def run(self, address: str) -> int:
+        try:
+            asyncio.run(self.serve(address))
+        except KeyboardInterrupt:
+            pass
+        return 0
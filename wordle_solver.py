@@ -1,15 +1,58 @@
-from itertools import compress
+import numpy as np
 from collections import defaultdict
 from wordle_helper import WordleHelper
+from wordle_feedback import WordleFeedback, MAX_WORD_LEN
+from wordle_word_table import WordleWordTable
+from wordle_compiled_words import WordleCompiledWords
+from wordle_tracer import WordleTracer, NO_TRACE
+from wordle_lookahead import WordleLookahead
 
 MAX_GUESSES = 6
 
+# Number of best-scoring words returned by _calc_word_scores (enough to print, and to compare the top 2)
+SCORE_TOP_K = 10
+
+# Guess selection strategies:
+#   heuristic    - score words on letter, letter-position and English word frequencies
+#   entropy      - choose the guess with the highest expected information (in bits) from its feedback
+#   min_expected - choose the guess that leaves the fewest remaining words on average
+#   lookahead    - search a few guesses ahead from the top heuristic guesses, within a time budget per move (see
+#                  WordleLookahead)
+STRATEGIES = ('heuristic', 'entropy', 'min_expected', 'lookahead')
+
+# Number of opening turns whose guesses are looked up in (and recorded into) an opening book, when one is given
+OPENING_BOOK_DEPTH = 2
+
 optimal_score_settings = {
     False: (2.287, 1.628, 0.653, 0.017, 0.409),
     True: (1.053, 1.808, 1.219, 0.748, 0)
 }
 
-INIT_WORD_FREQ_CACHE = {}
+# The dictionary to play with (see WordleSolver.configure_dictionary):
+#   words_path         word-frequency CSV to load the dictionary from
+#   word_len           only words of this length are used
+#   min_frequency      words used fewer times than this are left out
+#   stats_sample_size  while more words than this remain, the letter statistics used for scoring are estimated from
+#                      a random sample of this many of them (0 to always count every word) - smaller is faster but
+#                      less accurate
+dictionary_settings = {
+    'words_path': 'resources/word_frequencies.csv',
+    'word_len': 5,
+    'min_frequency': 0,
+    'stats_sample_size': 0
+}
+
+# Fixed seed for the letter statistics samples, so games stay repeatable
+STATS_SAMPLE_SEED = 0
+
+INIT_WORD_TABLE = None
+FEEDBACK_MATRIX_CACHE = None
+FEEDBACK_MATRIX_LOADED = False
+REPEATED_SUM_CACHE = {}
+
+# Max # of score values kept in REPEATED_SUM_CACHE (a game only uses 1.0 and its incorrect_pos_letter_score_factor,
+# but an optimizer run goes through a new factor for every sample)
+REPEATED_SUM_CACHE_SIZE = 4
 
 
 class WordleSolver:
@@ -33,20 +76,29 @@ class WordleSolver:
             best_word_score_cutoff_factor: float = None,
 
             # Do not display terminal output (useful when optimizing the scoring model)
-            suppress_output: bool = False
+            suppress_output: bool = False,
+
+            # Guesses for the opening turns keyed by the feedback history so far (see WordleOpeningBook) - looked up
+            #   before scoring, and any missing entries are filled in as they are scored
+            opening_book: dict = None,
+
+            # How to choose each guess - one of STRATEGIES
+            strategy: str = 'heuristic',
+
+            # Records per-turn phase timings and word counts into this tracer (nothing is recorded without one)
+            tracer: WordleTracer = None,
+
+            # Precomputed guesses for every state of the game (see WordleDecisionTree) - followed for as long as the
+            #   game stays in the tree, then the words are scored as usual
+            decision_tree=None
     ):
-        self.tries = 0
         self.max_tries = MAX_GUESSES
-        self.correctly_guessed = False
         self.hard_mode = hard_mode
         self.suppress_output = suppress_output
-
-        self.incorrectly_placed_letters = dict()
-        self.correctly_placed_letters = dict()
-        self.required_letter_counts_exact = defaultdict(int)
-        self.required_letter_counts_min = defaultdict(int)
-        self.guessed_words = set()
-        self.eliminated_word_count = 0
+        self.opening_book = opening_book
+        self.strategy = strategy
+        self.tracer = tracer
+        self.decision_tree = decision_tree
 
         self.letter_freq_score_factor = letter_freq_score_factor if letter_freq_score_factor else optimal_score_settings[hard_mode][0]
         self.letter_pos_freq_score_factor = letter_pos_freq_score_factor if letter_pos_freq_score_factor else optimal_score_settings[hard_mode][1]
@@ -54,21 +106,127 @@ class WordleSolver:
         self.incorrect_pos_letter_score_factor = incorrect_pos_letter_score_factor if incorrect_pos_letter_score_factor else optimal_score_settings[hard_mode][3]
         self.best_word_score_cutoff_factor = best_word_score_cutoff_factor if best_word_score_cutoff_factor else optimal_score_settings[hard_mode][4]
 
-        self.remaining_words = WordleSolver.load_words()
+        self.score_settings = (self.letter_freq_score_factor, self.letter_pos_freq_score_factor, self.eng_word_freq_score_factor, self.incorrect_pos_letter_score_factor, self.best_word_score_cutoff_factor)
+
+        self.reset()
 
         if not self.suppress_output:
             print("\n*** Wordle Solver - {} mode ***".format('HARD' if self.hard_mode else 'EASY'))
 
+    def reset(self):
+        # Starts a new game, keeping the mode, scoring settings and opening book
+        self.tries = 0
+        self.correctly_guessed = False
+
+        self.incorrectly_placed_letters = dict()
+        self.correctly_placed_letters = dict()
+        self.guessed_words = set()
+        self.feedback_history = []
+        self.eliminated_word_count = 0
+        self.decision_tree_node = 0 if self.decision_tree is not None and len(self.decision_tree) else -1
+
+        # The remaining words are tracked as a set of indices into the shared (read-only) word table, starting out
+        # as the table's own index array - so a new game doesn't copy anything until the first words are eliminated
+        word_table = WordleSolver.load_words()
+        self.remaining_word_indices = word_table.all_indices
+
+        # Running letter tallies over the remaining words, kept up to date as words are eliminated (see
+        # WordleWordTable.position_counts / letter_count_totals)
+        self.position_counts = word_table.initial_position_counts
+        self.letter_count_totals = word_table.initial_letter_count_totals
+        self.letter_tallies_estimated = False
+        self.stats_sample_rng = None
+
+        if self.tracer:
+            self.tracer.begin_game(hard_mode=self.hard_mode, strategy=self.strategy)
+
+    def add_feedback(self, guessed_word: str, wrongly_placed_letter_positions, correctly_placed_letter_positions):
+        # Records a guess and the feedback it got (positions start from 1) - for driving the solver without
+        # play_game, e.g. when the guesses were made elsewhere
+        self.tries += 1
+        self._process_feedback(guessed_word, wrongly_placed_letter_positions, correctly_placed_letter_positions)
+
+    def next_guess(self):
+        # Returns the best guess for the current state (or None if no words remain) without counting it as a try
+        return self._choose_guess()
+
     @staticmethod
-    def load_words() -> dict:
-        global INIT_WORD_FREQ_CACHE
-        if INIT_WORD_FREQ_CACHE:
-            return INIT_WORD_FREQ_CACHE.copy()
+    def configure_dictionary(words_path: str = None, word_len: int = None, min_frequency: int = None, stats_sample_size: int = None):
+        # Switches to a different dictionary (see dictionary_settings) - the word tables are reloaded on next use
+        global INIT_WORD_TABLE, FEEDBACK_MATRIX_CACHE, FEEDBACK_MATRIX_LOADED
+        if word_len is not None and not 1 <= word_len <= MAX_WORD_LEN:
+            raise ValueError("word length must be from 1 to {}".format(MAX_WORD_LEN))
+        for key, value in (('words_path', words_path), ('word_len', word_len), ('min_frequency', min_frequency), ('stats_sample_size', stats_sample_size)):
+            if value is not None:
+                dictionary_settings[key] = value
+
+        INIT_WORD_TABLE = None
+        FEEDBACK_MATRIX_CACHE = None
+        FEEDBACK_MATRIX_LOADED = False
+        REPEATED_SUM_CACHE.clear()
+        WordleLookahead.clear_memo()
 
-        words_and_frequencies = WordleHelper.load_words()
-        WordleHelper.normalize_values(words_and_frequencies)
-        INIT_WORD_FREQ_CACHE = words_and_frequencies.copy()
-        return words_and_frequencies
+    @staticmethod
+    def load_words() -> WordleWordTable:
+        global INIT_WORD_TABLE
+        if INIT_WORD_TABLE:
+            return INIT_WORD_TABLE
+
+        # The (normalized) word frequencies come from the compiled word file, which is rebuilt from the dictionary
+        # source whenever that changes
+        words, letter_codes, frequencies, _ = WordleCompiledWords.load(dictionary_settings['words_path'], word_len=dictionary_settings['word_len'], min_frequency=dictionary_settings['min_frequency'])
+        if not words:
+            raise ValueError("no {} letter words in {}".format(dictionary_settings['word_len'], dictionary_settings['words_path']))
+        INIT_WORD_TABLE = WordleWordTable(words, frequencies, letter_codes)
+        return INIT_WORD_TABLE
+
+    @staticmethod
+    def word_list() -> list:
+        WordleSolver.load_words()
+        return INIT_WORD_TABLE.words
+
+    @staticmethod
+    def word_index(word: str):
+        WordleSolver.load_words()
+        return INIT_WORD_TABLE.word_index.get(word)
+
+    @staticmethod
+    def load_feedback_matrix():
+        # Returns the precomputed feedback pattern matrix, or None if the dictionary is too large for one
+        global FEEDBACK_MATRIX_CACHE, FEEDBACK_MATRIX_LOADED
+        if FEEDBACK_MATRIX_LOADED:
+            return FEEDBACK_MATRIX_CACHE
+
+        if not INIT_WORD_TABLE:
+            WordleSolver.load_words()
+        FEEDBACK_MATRIX_CACHE = WordleFeedback.load_pattern_matrix(INIT_WORD_TABLE.words)
+        FEEDBACK_MATRIX_LOADED = True
+        return FEEDBACK_MATRIX_CACHE
+
+    @staticmethod
+    def lookup_feedback(guess_word: str, target_word: str):
+        # Returns the feedback pattern code for the guess against the target word from the precomputed matrix, or
+        # None if either word is not part of the dictionary (or there is no matrix)
+        feedback_matrix = WordleSolver.load_feedback_matrix()
+        word_index = INIT_WORD_TABLE.word_index
+        if feedback_matrix is None or guess_word not in word_index or target_word not in word_index:
+            return None
+        return int(feedback_matrix[word_index[guess_word], word_index[target_word]])
+
+    @staticmethod
+    def pattern_codes(guess_index: int, answer_indices: np.ndarray) -> np.ndarray:
+        # Returns the feedback pattern codes for one guess against each of the answers
+        feedback_matrix = WordleSolver.load_feedback_matrix()
+        if feedback_matrix is not None:
+            return feedback_matrix[guess_index, answer_indices]
+        return WordleFeedback.calc_pattern_codes(INIT_WORD_TABLE.letter_codes[[guess_index]], INIT_WORD_TABLE.letter_codes[answer_indices])[0]
+
+    @property
+    def remaining_words(self) -> list:
+        return INIT_WORD_TABLE.get_words(self.remaining_word_indices)
+
+    def _trace_phase(self, name: str):
+        return self.tracer.phase(name) if self.tracer else NO_TRACE
 
     def is_game_won(self):
         return self.correctly_guessed
@@ -76,109 +234,182 @@ class WordleSolver:
     def is_game_lost(self):
         return self.tries >= self.max_tries
 
+    @staticmethod
+    def _repeated_sums(score_val: float) -> list:
+        # Entry n is score_val added to itself n times - the same floating point value as tallying the score one word
+        # at a time, which multiplying by n doesn't always reproduce (and that can break ties between word scores)
+        # The least recently used values are dropped first (pops that miss are fine - server threads share the cache)
+        score_val_sums = REPEATED_SUM_CACHE.pop(score_val, None)
+        if score_val_sums is None:
+            score_val_sums = [0.0] + np.cumsum(np.full(len(INIT_WORD_TABLE), score_val)).tolist()
+            while len(REPEATED_SUM_CACHE) >= REPEATED_SUM_CACHE_SIZE:
+                REPEATED_SUM_CACHE.pop(next(iter(REPEATED_SUM_CACHE)), None)
+        REPEATED_SUM_CACHE[score_val] = score_val_sums
+        return score_val_sums
+
     def _calc_letter_and_position_scores(self) -> (defaultdict, defaultdict):
-        # Count occurrences of each letter in all words
+        # Build the letter scores from the running tallies of letter occurrences in the remaining words
         letter_scores = defaultdict(float)
         position_scores = defaultdict(lambda: defaultdict(float))
         incorrectly_placed_letter_set = set(self.incorrectly_placed_letters.values())
 
-        for word in self.remaining_words:
-            seen_letters = set()
-            for i, c in enumerate(word):
-                # Skip any letter in a GREEN position - they shouldn't add weight to the scoring since they will exist
-                # in every remaining word, and doing so makes them more likely to appear in undetermined positions
-                # (duplicate letters become the norm rather than the exception)
-                if i in self.correctly_placed_letters: continue
-
-                score_val = self.incorrect_pos_letter_score_factor if c in incorrectly_placed_letter_set else 1.0
-                position_scores[i][c] += score_val
-                if c not in seen_letters:
-                    letter_scores[c] += score_val
-                    seen_letters.add(c)
+        # Skip any letter in a GREEN position - they shouldn't add weight to the scoring since they will exist
+        # in every remaining word, and doing so makes them more likely to appear in undetermined positions
+        # (duplicate letters become the norm rather than the exception).  Every remaining word has the GREEN letters
+        # in place, so a word contains a letter outside the GREEN positions when it has more copies of that letter
+        # than there are GREEN positions holding it
+        green_letter_counts = defaultdict(int)
+        for c in self.correctly_placed_letters.values():
+            green_letter_counts[c] += 1
+        open_positions = [i for i in range(self.position_counts.shape[0]) if i not in self.correctly_placed_letters]
+
+        position_counts = self.position_counts.tolist()
+        for code in np.flatnonzero(self.position_counts.any(axis=0)).tolist():
+            c = chr(code)
+            score_val = self.incorrect_pos_letter_score_factor if c in incorrectly_placed_letter_set else 1.0
+            score_val_sums = WordleSolver._repeated_sums(score_val)
+
+            words_with_letter = int(self.letter_count_totals[green_letter_counts[c] + 1, code])
+            if words_with_letter:
+                letter_scores[c] = score_val_sums[words_with_letter]
+            for i in open_positions:
+                if position_counts[i][code]:
+                    position_scores[i][c] = score_val_sums[position_counts[i][code]]
 
         # print(list(letter_scores.items()))
-        # print("total words: {}".format(len(self.remaining_words)))
+        # print("total words: {}".format(len(self.remaining_word_indices)))
 
         # Normalize frequencies of each letter
-        letter_scores, sorted_letter_frequencies = WordleHelper.normalize_values(letter_scores, len(self.remaining_words), norm_to_middle=True)
+        letter_scores, sorted_letter_frequencies = WordleHelper.normalize_values(letter_scores, len(self.remaining_word_indices), norm_to_middle=True, top_k=0 if self.suppress_output else 15)
         WordleHelper.print_top_k(sorted_letter_frequencies, label='letter frequencies', k=15, suppress_output=self.suppress_output)
         # WordleHelper.print_top_k(sorted_letter_frequencies, label='letter frequencies', k=8, suppress_output=self.suppress_output)
 
         # Normalize letter-position distributions
         for i in position_scores.keys():
-            _, sorted_position_frequencies = WordleHelper.normalize_values(position_scores[i], len(self.remaining_words), norm_to_middle=True)
+            _, sorted_position_frequencies = WordleHelper.normalize_values(position_scores[i], len(self.remaining_word_indices), norm_to_middle=True, top_k=0)
             # WordleHelper.print_top_k(sorted_position_frequencies, label='letter position #{} frequencies'.format(i+1), k=10, suppress_output=self.suppress_output)
 
         return letter_scores, position_scores
 
-    # Score words based on letter frequencies + how likely each letter is to appear in its position within the word
-    # Don't score duplicate letters more than once - this prioritizes words with more unique letters
-    def _score_word(self, word: str, letter_scores: defaultdict, position_scores: defaultdict, word_frequencies: dict) -> float:
-        if word in self.guessed_words:
-            return 0.0
-
-        # 1. Score this word based on its use frequency in the English language (more frequently-used words in
-        #   English are given slightly higher scores).  This is mainly used for tie-breaking
-        word_freq_score = word_frequencies[word] * self.eng_word_freq_score_factor
-
-        letter_score = 0.0
-        position_score = 0.0
-        used_letters = set()
-        for i, letter in enumerate(word):
-            # 2. Score each letter based on its frequency within the remaining set of words
-            #   but don't score duplicate letters more than once
-            if letter not in used_letters:
-                # score += letter_scores[letter] * self.letter_freq_score_factor
-                letter_score += letter_scores[letter]
-                used_letters.add(letter)
-
-            # 3. Score based on likelihood of each letter appearing in each position within the remaining word set
-            # score += position_scores[i][letter] * self.letter_pos_freq_score_factor
-            position_score += position_scores[i][letter]
-
-        return word_freq_score + (letter_score * self.letter_freq_score_factor) + (position_score * self.letter_pos_freq_score_factor)
-
-    def _calc_word_scores(self):
-        letter_scores, position_scores = self._calc_letter_and_position_scores()
+    def _score_words(self, indices: np.ndarray, letter_value_table: np.ndarray, position_value_table: np.ndarray, word_frequencies: np.ndarray, top_k: int) -> list:
+        # Score words based on letter frequencies + how likely each letter is to appear in its position within the
+        # word, plus their use frequency in the English language (mainly for tie-breaking).  Duplicate letters aren't
+        # scored more than once - this prioritizes words with more unique letters.  Returns the top K (word, score)
+        # pairs, best first
+        scores = INIT_WORD_TABLE.score_words(indices, letter_value_table, position_value_table, word_frequencies * self.eng_word_freq_score_factor, self.letter_freq_score_factor, self.letter_pos_freq_score_factor)
+        for word in self.guessed_words:
+            scores[indices == INIT_WORD_TABLE.word_index.get(word, -1)] = 0.0
+
+        top_indices = WordleHelper.top_k_indices(scores, top_k)
+        return list(zip(INIT_WORD_TABLE.get_words(indices[top_indices]), scores[top_indices].tolist()))
+
+    def _calc_word_scores(self, top_k: int = SCORE_TOP_K):
+        if self.strategy not in ('heuristic', 'lookahead'):
+            with self._trace_phase('partition_scores'):
+                return self._calc_partition_scores(top_k)
+
+        with self._trace_phase('letter_scores'):
+            letter_scores, position_scores = self._calc_letter_and_position_scores()
+
+        # Turn the score dicts into dense lookup tables indexed by letter byte-code, so all words can be scored at once
+        letter_value_table = np.zeros(256)
+        for c, score in letter_scores.items():
+            letter_value_table[ord(c)] = score
+        position_value_table = np.zeros((INIT_WORD_TABLE.letter_codes.shape[1], 256))
+        for i, scores in position_scores.items():
+            for c, score in scores.items():
+                position_value_table[i, ord(c)] = score
 
         # Score remaining words first based on all 3 scoring components
-        # rem_word_scores = dict(map(lambda w: (w, self._score_word(w, letter_scores, position_scores, self.remaining_word_frequencies)), self.remaining_words))
-        rem_word_scores = dict(map(lambda w: (w, self._score_word(w, letter_scores, position_scores, self.remaining_words)), self.remaining_words))
-        rem_sorted_word_scores = sorted(filter(lambda t: t[1] > 0, rem_word_scores.items()), key=lambda item: item[1], reverse=True)
+        with self._trace_phase('renormalize_frequencies'):
+            remaining_word_frequencies = self._calc_remaining_word_frequencies()
+        with self._trace_phase('score_remaining_words'):
+            rem_sorted_word_scores = self._score_words(self.remaining_word_indices, letter_value_table, position_value_table, remaining_word_frequencies, max(top_k, 2))
 
         # If playing in hard mode, we can only guess from this list
         # If in easy mode, choose from this list when only 1-2 choices remain, or if one word is a clear winner
-        if self.hard_mode or len(self.remaining_words) <= 2 or rem_sorted_word_scores[0][1] >= (rem_sorted_word_scores[1][1] * (1 + self.best_word_score_cutoff_factor)):
+        if self.hard_mode or len(self.remaining_word_indices) <= 2 or rem_sorted_word_scores[0][1] >= (rem_sorted_word_scores[1][1] * (1 + self.best_word_score_cutoff_factor)):
             # print("\n*** CHOSE FROM REMAINING LIST ***")
             return rem_sorted_word_scores, None
 
         # For 'easy' mode where there is no clear winning remaining word, choose a word from the larger / initial list
         #  In that case, use the letter frequencies from just the remaining words (try to eliminate as many remaining
         #  words as possible) but use word frequencies from the initial list and ignore position frequencies entirely
-        # all_word_scores = dict(map(lambda w: (w, self._score_word(w, letter_scores, defaultdict(lambda: defaultdict(float)), INIT_WORD_FREQ_CACHE[self.word_len])), INIT_WORD_CACHE[self.word_len]))
-
-        all_word_scores = dict(map(lambda w: (w, self._score_word(w, letter_scores, position_scores, INIT_WORD_FREQ_CACHE)), INIT_WORD_FREQ_CACHE.keys()))
-        all_sorted_word_scores = sorted(filter(lambda t: t[1] > 0, all_word_scores.items()), key=lambda item: item[1], reverse=True)
+        if self.tracer:
+            self.tracer.record(full_dictionary=True)
+        with self._trace_phase('score_all_words'):
+            all_sorted_word_scores = self._score_words(INIT_WORD_TABLE.all_indices, letter_value_table, position_value_table, INIT_WORD_TABLE.frequencies, top_k)
         # print("\n*** CHOSE FROM COMPLETE LIST ***")
 
         return rem_sorted_word_scores, all_sorted_word_scores
 
+    def _calc_partition_scores(self, top_k: int = SCORE_TOP_K):
+        # Scores each allowed guess by how it would split the remaining words into groups by feedback pattern, using
+        # the precomputed feedback matrix.  Returns the same structure as the heuristic scoring: the top K remaining
+        # words, plus the top K of all words in easy mode (any word can be guessed there)
+        remaining_count = len(self.remaining_word_indices)
+        if remaining_count <= 0: return [], None
+
+        guess_indices = self.remaining_word_indices if self.hard_mode else INIT_WORD_TABLE.all_indices
+        if self.tracer:
+            self.tracer.record(full_dictionary=not self.hard_mode)
+        feedback_matrix = WordleSolver.load_feedback_matrix()
+        word_len = INIT_WORD_TABLE.letter_codes.shape[1]
+
+        if self.strategy == 'entropy':
+            # Expected information in bits: log2(N) - sum(n * log2(n)) / N over the group sizes n
+            group_sizes = np.arange(1, remaining_count + 1, dtype=np.float64)
+            group_info = np.concatenate(([0.0], group_sizes * np.log2(group_sizes)))
+            scores = np.log2(remaining_count) - WordleFeedback.sum_group_scores(feedback_matrix, guess_indices, self.remaining_word_indices, word_len, lambda counts: group_info[counts], INIT_WORD_TABLE.letter_codes) / remaining_count
+            ranking_key = -scores
+        else:
+            # Expected # of remaining words after the guess: sum(n^2) / N over the group sizes n
+            scores = WordleFeedback.sum_group_scores(feedback_matrix, guess_indices, self.remaining_word_indices, word_len, lambda counts: counts * counts, INIT_WORD_TABLE.letter_codes) / float(remaining_count)
+            ranking_key = scores
+
+        # Ties are broken in favour of words that could still be the answer, then by dictionary order
+        is_remaining_word = np.isin(guess_indices, self.remaining_word_indices, assume_unique=True)
+        for word in self.guessed_words:
+            is_remaining_word &= guess_indices != INIT_WORD_TABLE.word_index.get(word, -1)
+            ranking_key = np.where(guess_indices == INIT_WORD_TABLE.word_index.get(word, -1), np.inf, ranking_key)
+        order = np.lexsort((guess_indices, ~is_remaining_word, ranking_key))
+        order = order[np.isfinite(ranking_key[order])]
+
+        def top_scores(selected_order):
+            selected_order = selected_order[:top_k]
+            return list(zip(INIT_WORD_TABLE.get_words(guess_indices[selected_order]), scores[selected_order].tolist()))
+
+        rem_sorted_word_scores = top_scores(order[is_remaining_word[order]])
+        if self.hard_mode:
+            return rem_sorted_word_scores, None
+        return rem_sorted_word_scores, top_scores(order)
+
     def _process_feedback(self, guessed_word, wrongly_placed_letter_positions, correctly_placed_letter_positions):
+        if self.tracer:
+            self.tracer.turn(len(self.feedback_history) + 1, len(self.remaining_word_indices))
+
         self.guessed_words.add(guessed_word)
+        self.feedback_history.append((guessed_word, WordleFeedback.encode_feedback(wrongly_placed_letter_positions, correctly_placed_letter_positions)))
+        if self.decision_tree_node >= 0:
+            self.decision_tree_node = self.decision_tree.child(self.decision_tree_node, *self.feedback_history[-1])
 
         total_letter_counts_observed = defaultdict(int)
         temp_letter_set = set()
         total_correctly_placed = 0
+        guess_incorrectly_placed_letters = []
+        guess_correctly_placed_letters = []
 
         for i, letter in enumerate(guessed_word):
             if i+1 in wrongly_placed_letter_positions:
                 # these can accumulate between guesses
                 self.incorrectly_placed_letters[i] = letter
+                guess_incorrectly_placed_letters.append((i, letter))
                 total_letter_counts_observed[letter] += 1
 
             elif i+1 in correctly_placed_letter_positions:
                 # these can accumulate between guesses
                 self.correctly_placed_letters[i] = letter
+                guess_correctly_placed_letters.append((i, letter))
                 total_letter_counts_observed[letter] += 1
                 total_correctly_placed += 1
 
@@ -186,85 +417,138 @@ class WordleSolver:
                 # Temporarily track grey / invalid letters to process on next pass
                 temp_letter_set.add(letter)
 
-        # Now process the grey letters since the observed letter counts have been tallied up
-        # The total # of each of these letters can be inferred from how many appeared in correct / incorrect positions
-        # within the word (yellow or green tiles) - this is how duplicate letters can be properly handled
-        for letter in temp_letter_set:
-            self.required_letter_counts_exact[letter] = total_letter_counts_observed[letter]
-
-        # Can also infer that the minimum # of a given letter must be equal to the total # of yellow + green
-        # instances of that letter
-        for letter in total_letter_counts_observed:
-            self.required_letter_counts_min[letter] = max(total_letter_counts_observed[letter], self.required_letter_counts_min[letter])
-
         if total_correctly_placed >= len(guessed_word):
             self.correctly_guessed = True
 
-        # Now eliminate words based on the cumulative feedback from all previous guesses
+        # Now eliminate words based on the feedback.  The remaining words already satisfy the feedback from all
+        # previous guesses, so only this guess's constraints need to be applied:
+        #   - the minimum # of each letter is the total # of its yellow + green instances
+        #   - for the grey letters, the total # is known exactly - it's how many appeared in correct / incorrect
+        #     positions within the word (yellow or green tiles), which is how duplicate letters are handled
         if not self.is_game_won():
-            self._eliminate_words(guessed_word)
-
-    def _calc_remaining_word_frequencies(self):
-        for word in self.remaining_words:
-            self.remaining_words[word] = INIT_WORD_FREQ_CACHE[word]
-        WordleHelper.normalize_values(self.remaining_words)
-
-    def _is_valid_word(self, word) -> bool:
-        letter_counts = defaultdict(int)
-        for i, letter in enumerate(word):
-            # Track the total # of each letter observed in this word
-            letter_counts[letter] += 1
-
-            # Ensure green letters are found in this word exactly
-            if i in self.correctly_placed_letters and self.correctly_placed_letters[i] != letter:
-                return False
-
-            # Ensure that this word does not contain a misplaced letter in a yellow space (i.e. does not
-            # place another L onto a yellow L space)
-            if i in self.incorrectly_placed_letters and self.incorrectly_placed_letters[i] == letter:
-                return False
-
-        # Ensure this word contains at least the same number of yellow + green letters observed so far
-        for letter in self.required_letter_counts_min:
-            if letter_counts[letter] < self.required_letter_counts_min[letter]:
-                return False
-
-        # One final check to ensure all the known letter counts have been observed exactly in this word
-        for letter in self.required_letter_counts_exact:
-            if letter_counts[letter] != self.required_letter_counts_exact[letter]:
-                return False
-
-        # Keep tracking this word only if all checks above are passed
-        return True
-
-    def _eliminate_words(self, guessed_word: str):
+            with self._trace_phase('eliminate_words'):
+                self._eliminate_words(guessed_word, guess_correctly_placed_letters, guess_incorrectly_placed_letters, list(total_letter_counts_observed.items()),
+                                      [(letter, total_letter_counts_observed[letter]) for letter in temp_letter_set])
+
+        if self.tracer:
+            self.tracer.end_turn(guessed_word, len(self.remaining_word_indices))
+
+    def _calc_remaining_word_frequencies(self) -> np.ndarray:
+        # Word frequencies for the remaining words only, re-normalized so the most frequent remaining word has 1.0
+        remaining_word_frequencies = INIT_WORD_TABLE.frequencies[self.remaining_word_indices]
+        if len(remaining_word_frequencies) <= 0: return remaining_word_frequencies
+        return remaining_word_frequencies / remaining_word_frequencies.max()
+
+    def _update_letter_tallies(self, new_remaining_word_indices: np.ndarray):
+        # Subtract the tallies of the eliminated words, unless fewer words remain than were removed - in which case
+        # it's cheaper to re-tally the remaining words directly
+        stats_sample_size = dictionary_settings['stats_sample_size']
+        if stats_sample_size and len(new_remaining_word_indices) > stats_sample_size:
+            # Too many words remain to tally exactly - estimate the tallies from a sample, scaled up to the full count
+            if self.stats_sample_rng is None:
+                self.stats_sample_rng = np.random.default_rng(STATS_SAMPLE_SEED)
+            sample = np.sort(self.stats_sample_rng.choice(new_remaining_word_indices, stats_sample_size, replace=False))
+            scale = len(new_remaining_word_indices) / float(stats_sample_size)
+            self.position_counts = np.rint(INIT_WORD_TABLE.position_counts(sample) * scale).astype(np.int64)
+            self.letter_count_totals = np.rint(INIT_WORD_TABLE.letter_count_totals(sample) * scale).astype(np.int64)
+            self.letter_tallies_estimated = True
+            return
+
+        removed_word_count = len(self.remaining_word_indices) - len(new_remaining_word_indices)
+        if self.letter_tallies_estimated:
+            self.position_counts = INIT_WORD_TABLE.position_counts(new_remaining_word_indices)
+            self.letter_count_totals = INIT_WORD_TABLE.letter_count_totals(new_remaining_word_indices)
+            self.letter_tallies_estimated = False
+            return
+        if removed_word_count <= 0: return
+
+        # (the tallies start out shared with the word table, so they're never updated in place)
+        if removed_word_count < len(new_remaining_word_indices):
+            # Both index arrays are sorted, so the remaining words can be found with a binary search
+            is_removed = np.ones(len(self.remaining_word_indices), dtype=bool)
+            is_removed[np.searchsorted(self.remaining_word_indices, new_remaining_word_indices)] = False
+            removed_word_indices = self.remaining_word_indices[is_removed]
+            self.position_counts = self.position_counts - INIT_WORD_TABLE.position_counts(removed_word_indices)
+            self.letter_count_totals = self.letter_count_totals - INIT_WORD_TABLE.letter_count_totals(removed_word_indices)
+        else:
+            self.position_counts = INIT_WORD_TABLE.position_counts(new_remaining_word_indices)
+            self.letter_count_totals = INIT_WORD_TABLE.letter_count_totals(new_remaining_word_indices)
+
+    def _eliminate_words(self, guessed_word: str, correctly_placed_letters: list, incorrectly_placed_letters: list, required_letter_counts_min: list, required_letter_counts_exact: list):
         # Produce new list of remaining words by removing the guessed word and filtering down to only those
-        # that are still valid based on the new feedback
-        new_remaining_words = dict(compress(self.remaining_words.items(), map(lambda w: w != guessed_word and self._is_valid_word(w), self.remaining_words)))
+        # that are still valid based on the new feedback - looked up in the word table's inverted letter index
+        new_remaining_word_indices = INIT_WORD_TABLE.letter_index().matching_words(self.remaining_word_indices, correctly_placed_letters, incorrectly_placed_letters, required_letter_counts_min, required_letter_counts_exact)
+        new_remaining_word_indices = new_remaining_word_indices[new_remaining_word_indices != INIT_WORD_TABLE.word_index.get(guessed_word, -1)]
+        with self._trace_phase('update_letter_tallies'):
+            self._update_letter_tallies(new_remaining_word_indices)
 
-        self.eliminated_word_count = len(self.remaining_words) - len(new_remaining_words)
-        self.remaining_words = new_remaining_words
+        self.eliminated_word_count = len(self.remaining_word_indices) - len(new_remaining_word_indices)
+        self.remaining_word_indices = new_remaining_word_indices
 
-        # Update calcs of word frequencies for remaining words only
-        self._calc_remaining_word_frequencies()
+        # Word frequencies for the remaining words are re-normalized lazily, only when the words are next scored
 
         # if not self.suppress_output:
-        #     print("\n*** {} words remaining ({} eliminated) ***".format(len(self.remaining_words), eliminated_word_count))
+        #     print("\n*** {} words remaining ({} eliminated) ***".format(len(self.remaining_word_indices), eliminated_word_count))
+
+    def _choose_guess(self):
+        # While the game is still in the decision tree, its guess for this state is all that's needed
+        if self.decision_tree_node >= 0:
+            if self.tracer:
+                self.tracer.turn(len(self.feedback_history) + 1, len(self.remaining_word_indices))
+                self.tracer.record(decision_tree=True)
+            return self.decision_tree.guess(self.decision_tree_node)
+
+        # The opening turns are played from the opening book when possible - the guess only depends on the feedback
+        # received so far, so there's no need to score the words again
+        book_key = tuple(self.feedback_history) if self.opening_book is not None and len(self.feedback_history) < OPENING_BOOK_DEPTH else None
+        best_guess = self.opening_book.get(book_key) if book_key is not None else None
+        if self.tracer:
+            self.tracer.turn(len(self.feedback_history) + 1, len(self.remaining_word_indices))
+            self.tracer.record(opening_book=bool(best_guess))
+
+        if best_guess:
+            if not self.suppress_output:
+                print("\n*** Playing from opening book ***")
+        else:
+            # Score the words & print out the top K
+            with self._trace_phase('score_words'):
+                rem_word_scores, all_word_scores = self._calc_word_scores()
+            WordleHelper.print_top_k(rem_word_scores, label='remaining word scores', k=10, suppress_output=self.suppress_output)
+            if all_word_scores:
+                WordleHelper.print_top_k(all_word_scores, label='all word scores', k=10, suppress_output=self.suppress_output)
+
+            # The best word, if at least 1 remains
+            best_guess = all_word_scores[0][0] if all_word_scores else (rem_word_scores[0][0] if len(rem_word_scores) > 0 else None)
+            if best_guess and self.strategy == 'lookahead':
+                with self._trace_phase('lookahead_search'):
+                    best_guess = self._lookahead_guess(rem_word_scores, all_word_scores)
+            if book_key is not None and best_guess:
+                self.opening_book[book_key] = best_guess
+
+        return best_guess
+
+    def _lookahead_guess(self, rem_word_scores: list, all_word_scores: list) -> str:
+        # Searches ahead from the top heuristic guesses - the remaining words' and, in easy mode, all words' (the
+        # heuristic's own pick stays first, so it's played if the budget runs out before anything better is found)
+        lookahead = WordleLookahead(INIT_WORD_TABLE, WordleSolver.load_feedback_matrix())
+        candidate_words = [word for word, _ in (all_word_scores or [])[:lookahead.top_n]]
+        candidate_words += [word for word, _ in rem_word_scores[:lookahead.top_n] if word not in candidate_words]
+
+        best_guess, depth = lookahead.search(candidate_words, self.remaining_word_indices)
+        if self.tracer:
+            self.tracer.record(lookahead_depth=depth, lookahead_evaluated=lookahead.evaluated_count)
+        if not self.suppress_output:
+            print("\n*** Lookahead: searched {} guess(es) {} deep, chose '{}' ***".format(lookahead.evaluated_count, depth, best_guess))
+        return best_guess
 
     def _make_guess(self):
-        # Score the words & print out the top K
-        rem_word_scores, all_word_scores = self._calc_word_scores()
-        WordleHelper.print_top_k(rem_word_scores, label='remaining word scores', k=10, suppress_output=self.suppress_output)
-        if all_word_scores:
-            WordleHelper.print_top_k(all_word_scores, label='all word scores', k=10, suppress_output=self.suppress_output)
-
+        best_guess = self._choose_guess()
         self.tries += 1
 
         if not self.suppress_output:
-            print("\n*** {} words remaining ({} eliminated) ***".format(len(self.remaining_words), self.eliminated_word_count))
+            print("\n*** {} words remaining ({} eliminated) ***".format(len(self.remaining_word_indices), self.eliminated_word_count))
 
-        # Return the best word, if at least 1 remains
-        return all_word_scores[0][0] if all_word_scores else (rem_word_scores[0][0] if len(rem_word_scores) > 0 else None)
+        return best_guess
 
     def play_game(self) -> int:
         while True:
@@ -0,0 +1,176 @@
+import os
+import json
+from contextlib import contextmanager, nullcontext
+from timeit import default_timer as timer
+
+# Max # of games whose individual turns are kept for export - the summary stats still cover every game after that
+TRACE_MAX_GAMES = 10000
+
+# Shared do-nothing context used in place of a phase timer when tracing is off
+NO_TRACE = nullcontext()
+
+
+class WordleTracer:
+    # Per-turn instrumentation for WordleSolver: the wall time of each scoring / elimination phase, the # of remaining
+    # and eliminated words on each turn, and whether the easy-mode scoring of the full dictionary kicked in.  A solver
+    # only records into a tracer when one is passed in, so there's no cost when tracing is off.  One tracer can be
+    # shared by every game of a simulation, and tracers from worker processes merged into one
+    def __init__(self, max_games: int = TRACE_MAX_GAMES):
+        self.max_games = max_games
+        self.games = []
+        self.game_count = 0
+        self.turn_count = 0
+
+        # Running totals over all games (including any whose turns weren't kept):
+        #   phase name -> [count, total seconds, max seconds]
+        #   turn number -> [count, total remaining words, total eliminated words, # that scored the full dictionary]
+        self.phase_stats = {}
+        self.turn_stats = {}
+
+        self.current_game = None
+        self.current_turn = None
+
+    def begin_game(self, **info):
+        # Times are absolute timer() values (consistent across processes), made relative when exported
+        self.game_count += 1
+        self.current_game = dict(info, pid=os.getpid(), start=timer(), turns=[])
+        self.current_turn = None
+        if len(self.games) < self.max_games:
+            self.games.append(self.current_game)
+
+    def annotate_game(self, **info):
+        if self.current_game is not None:
+            self.current_game.update(info)
+
+    def turn(self, turn_number: int, remaining_word_count: int) -> dict:
+        # Returns the record for this turn of the current game, starting it if needed
+        if self.current_turn is not None and self.current_turn['turn'] == turn_number:
+            return self.current_turn
+
+        if self.current_game is None:
+            self.begin_game()
+        self.turn_count += 1
+        self.current_turn = {'turn': turn_number, 'start': timer(), 'remaining': remaining_word_count, 'full_dictionary': False, 'phases': []}
+        self.current_game['turns'].append(self.current_turn)
+        return self.current_turn
+
+    def record(self, **values):
+        if self.current_turn is not None:
+            self.current_turn.update(values)
+
+    def end_turn(self, guessed_word: str, remaining_word_count: int):
+        turn = self.current_turn
+        if turn is None: return
+
+        turn.update(guess=guessed_word, remaining_after=remaining_word_count, eliminated=turn['remaining'] - remaining_word_count, duration=timer() - turn['start'])
+        stats = self.turn_stats.setdefault(turn['turn'], [0, 0, 0, 0])
+        stats[0] += 1
+        stats[1] += turn['remaining']
+        stats[2] += turn['eliminated']
+        stats[3] += int(turn['full_dictionary'])
+        self.current_turn = None
+
+    @contextmanager
+    def phase(self, name: str):
+        start = timer()
+        try:
+            yield
+        finally:
+            duration = timer() - start
+            stats = self.phase_stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += 1
+            stats[1] += duration
+            stats[2] = max(stats[2], duration)
+            if self.current_turn is not None:
+                self.current_turn['phases'].append((name, start, duration))
+
+    def merge(self, other: 'WordleTracer'):
+        # Adds the games and stats recorded by another tracer (e.g. from a worker process) to this one
+        self.game_count += other.game_count
+        self.turn_count += other.turn_count
+        self.games.extend(other.games[:max(0, self.max_games - len(self.games))])
+
+        for name, (count, total, longest) in other.phase_stats.items():
+            stats = self.phase_stats.setdefault(name, [0, 0.0, 0.0])
+            stats[0] += count
+            stats[1] += total
+            stats[2] = max(stats[2], longest)
+        for turn_number, other_stats in other.turn_stats.items():
+            stats = self.turn_stats.setdefault(turn_number, [0, 0, 0, 0])
+            for i, value in enumerate(other_stats):
+                stats[i] += value
+
+    def summary(self) -> dict:
+        phases = {}
+        for name, (count, total, longest) in sorted(self.phase_stats.items()):
+            phases[name] = {'count': count, 'total_ms': total * 1000, 'mean_ms': total * 1000 / count, 'max_ms': longest * 1000}
+
+        turns = {}
+        for turn_number, (count, remaining, eliminated, full_dictionary) in sorted(self.turn_stats.items()):
+            turns[turn_number] = {'count': count, 'avg_remaining': remaining / float(count), 'avg_eliminated': eliminated / float(count), 'full_dictionary_turns': full_dictionary}
+
+        return {
+            'games': self.game_count,
+            'turns': self.turn_count,
+            'full_dictionary_turns': sum(stats[3] for stats in self.turn_stats.values()),
+            'phases': phases,
+            'turns_by_number': turns
+        }
+
+    def _origin(self) -> float:
+        return min((game['start'] for game in self.games), default=0.0)
+
+    def to_json(self) -> dict:
+        # The summary plus every kept game, turn by turn (times in ms from the start of the first game)
+        origin = self._origin()
+        games = []
+        for game in self.games:
+            turns = []
+            for turn in game['turns']:
+                phases = [{'name': name, 'start_ms': (start - origin) * 1000, 'duration_ms': duration * 1000} for name, start, duration in turn['phases']]
+                turns.append(dict(turn, start=(turn['start'] - origin) * 1000, duration=turn.get('duration', 0.0) * 1000, phases=phases))
+            games.append(dict(game, start=(game['start'] - origin) * 1000, turns=turns))
+
+        return {'summary': self.summary(), 'dropped_games': self.game_count - len(self.games), 'games': games}
+
+    def to_chrome_trace(self) -> dict:
+        # Chrome trace-event format (load it in chrome://tracing or Perfetto) - one track per process, with a slice
+        # for each game, turn and phase, and a counter for the # of remaining words
+        origin = self._origin()
+        events = []
+
+        def micros(t: float) -> float:
+            return (t - origin) * 1e6
+
+        for game in self.games:
+            pid = game['pid']
+            game_end = max((turn['start'] + turn.get('duration', 0.0) for turn in game['turns']), default=game['start'])
+            game_args = {key: value for key, value in game.items() if key not in ('pid', 'start', 'turns')}
+            events.append({'name': 'game', 'ph': 'X', 'pid': pid, 'tid': pid, 'ts': micros(game['start']), 'dur': (game_end - game['start']) * 1e6, 'args': game_args})
+
+            for turn in game['turns']:
+                turn_args = {key: turn[key] for key in ('remaining', 'remaining_after', 'eliminated', 'guess', 'full_dictionary', 'opening_book', 'decision_tree') if key in turn}
+                events.append({'name': 'turn {}'.format(turn['turn']), 'ph': 'X', 'pid': pid, 'tid': pid, 'ts': micros(turn['start']), 'dur': turn.get('duration', 0.0) * 1e6, 'args': turn_args})
+                events.append({'name': 'remaining_words', 'ph': 'C', 'pid': pid, 'ts': micros(turn['start']), 'args': {'remaining': turn['remaining']}})
+                for name, start, duration in turn['phases']:
+                    events.append({'name': name, 'ph': 'X', 'pid': pid, 'tid': pid, 'ts': micros(start), 'dur': duration * 1e6})
+
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def save(self, json_path: str = None, chrome_trace_path: str = None):
+        if json_path:
+            with open(json_path, 'w') as f:
+                json.dump(self.to_json(), f, indent=1)
+        if chrome_trace_path:
+            with open(chrome_trace_path, 'w') as f:
+                json.dump(self.to_chrome_trace(), f)
+
+    def print_summary(self):
+        summary = self.summary()
+        print("\n*** Trace: {} games, {} turns, {} scored the full dictionary ***".format(summary['games'], summary['turns'], summary['full_dictionary_turns']))
+        print("\nphase\tcount\ttotal_ms\tmean_ms\tmax_ms")
+        for name, stats in summary['phases'].items():
+            print("{}\t{}\t{:.1f}\t{:.3f}\t{:.3f}".format(name, stats['count'], stats['total_ms'], stats['mean_ms'], stats['max_ms']))
+        print("\nturn\tcount\tavg_remaining\tavg_eliminated\tfull_dictionary_turns")
+        for turn_number, stats in summary['turns_by_number'].items():
+            print("{}\t{}\t{:.1f}\t{:.1f}\t{}".format(turn_number, stats['count'], stats['avg_remaining'], stats['avg_eliminated'], stats['full_dictionary_turns']))
@@ -0,0 +1,78 @@
+import numpy as np
+from wordle_feedback import WordleFeedback
+from wordle_letter_index import WordleLetterIndex
+
+
+class WordleWordTable:
+    # Array-backed view of the dictionary: the letter byte-code at each position of every word, plus which copy of
+    # its letter each of those letters is.  Built once and shared, so feedback constraints can be applied to whole sets of
+    # words as boolean masks rather than testing one word at a time
+    def __init__(self, words: list, frequencies: np.ndarray, letter_codes: np.ndarray = None):
+        self.words = list(words)
+        self.word_index = {word: i for i, word in enumerate(self.words)}
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.letter_codes = letter_codes if letter_codes is not None else WordleFeedback.encode_words(self.words)
+
+        # Which copy of its letter each letter is within its word (1 for the first copy, 2 for the second, ...) -
+        # duplicate letters only score once, and the copy numbers make it cheap to tally letter counts
+        self.occurrence = np.ones(self.letter_codes.shape, dtype=np.uint8)
+        for i in range(self.letter_codes.shape[1]):
+            for j in range(i):
+                self.occurrence[:, i] += self.letter_codes[:, i] == self.letter_codes[:, j]
+        self.first_occurrence = self.occurrence == 1
+
+        # Letter tallies for the whole dictionary - the starting point for each game's running tallies.  The table is
+        # shared by every game, so its arrays are made read-only
+        self.all_indices = np.arange(len(self.words))
+        self.initial_position_counts = self.position_counts(self.all_indices)
+        self.initial_letter_count_totals = self.letter_count_totals(self.all_indices)
+        for array in (self.frequencies, self.letter_codes, self.occurrence, self.first_occurrence, self.all_indices, self.initial_position_counts, self.initial_letter_count_totals):
+            if array.flags.writeable:
+                array.setflags(write=False)
+
+        # Built on first use - see letter_index()
+        self.cached_letter_index = None
+
+    def __len__(self):
+        return len(self.words)
+
+    def letter_index(self) -> WordleLetterIndex:
+        # The inverted (position, letter) / (letter, count) index used to apply feedback to sets of words
+        if self.cached_letter_index is None:
+            self.cached_letter_index = WordleLetterIndex(self.letter_codes, self.occurrence)
+        return self.cached_letter_index
+
+    def get_words(self, indices: np.ndarray) -> list:
+        return [self.words[i] for i in indices.tolist()]
+
+    def position_counts(self, indices: np.ndarray) -> np.ndarray:
+        # Returns a (word_len x 256) table with the number of the given words having each letter at each position
+        return np.stack([np.bincount(self.letter_codes[indices, i], minlength=256) for i in range(self.letter_codes.shape[1])]).astype(np.int64)
+
+    def letter_count_totals(self, indices: np.ndarray) -> np.ndarray:
+        # Returns a ((word_len + 2) x 256) table where row k holds the number of the given words containing at least
+        # k copies of each letter (the last row is always zero, so it can be indexed with k = word_len + 1)
+        word_len = self.letter_codes.shape[1]
+        totals = np.zeros((word_len + 2, 256), dtype=np.int64)
+        totals[0] = len(indices)
+
+        # A word contains at least k copies of a letter exactly when one of its positions holds the kth copy
+        codes = self.letter_codes[indices]
+        occurrence = self.occurrence[indices]
+        for k in range(1, word_len + 1):
+            totals[k] = np.bincount(codes[occurrence == k], minlength=256)
+        return totals
+
+    def score_words(self, indices: np.ndarray, letter_values: np.ndarray, position_values: np.ndarray, word_freq_scores: np.ndarray,
+                    letter_freq_score_factor: float, letter_pos_freq_score_factor: float) -> np.ndarray:
+        # Scores every given word at once from per-letter and per-(position, letter) score lookup tables.  The sums
+        # are accumulated position by position in word order, so each score comes out bit-for-bit identical to
+        # scoring the words one at a time (which keeps tie-breaking between equal scores unchanged)
+        letter_score = np.zeros(len(indices))
+        position_score = np.zeros(len(indices))
+        for i in range(self.letter_codes.shape[1]):
+            codes = self.letter_codes[indices, i]
+            letter_score += np.where(self.first_occurrence[indices, i], letter_values[codes], 0.0)
+            position_score += position_values[i, codes]
+
+        return word_freq_scores + (letter_score * letter_freq_score_factor) + (position_score * letter_pos_freq_score_factor)